@@ -4,6 +4,7 @@ import logging
 from typing import List, Dict, Any, Optional
 
 from .hierarchy_validator import HierarchyValidator
+from ..classifiers.prediction import Prediction
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +15,7 @@ class OutlineBuilder:
         self.validator = HierarchyValidator()
     
     def build(self, blocks: List[Dict], 
-             heading_predictions: List[Dict],
+             heading_predictions: List[Prediction],
              title_info: Optional[Dict] = None,
              toc_info: Optional[Dict] = None) -> Dict[str, Any]:
         """Build complete document outline"""
@@ -23,22 +24,22 @@ class OutlineBuilder:
         headings = []
         
         for pred in heading_predictions:
-            if pred.get('is_heading', False):
+            if pred.is_heading:
                 # Find corresponding block
-                block = next((b for b in blocks if b['id'] == pred['block_id']), None)
+                block = next((b for b in blocks if b['id'] == pred.block_id), None)
                 
                 if block:
                     # Use overridden text from prediction if available (for clean extracted text)
-                    heading_text = pred.get('text', block['text'].strip())
+                    heading_text = pred.text or block['text'].strip()
                     
                     # Keep headings clean - no content collection
                     # This works for any document type (academic, business, technical, etc.)
                     
                     heading = {
-                        'level': pred.get('level', 'H2'),
+                        'level': pred.level,
                         'text': heading_text,
                         'page': block.get('page', 1),
-                        'confidence': pred.get('confidence', 0.0),
+                        'confidence': pred.confidence,
                         'block_id': block['id'],
                         'font_size': block.get('font_size', 0),
                         'position': {
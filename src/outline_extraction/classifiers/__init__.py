@@ -2,5 +2,6 @@
 from .hierarchy_classifier import HierarchyClassifier
 from .ensemble_voter import EnsembleVoter
 from .confidence_scorer import ConfidenceScorer
+from .prediction import Prediction
 
-__all__ = ['HierarchyClassifier', 'EnsembleVoter', 'ConfidenceScorer']
\ No newline at end of file
+__all__ = ['HierarchyClassifier', 'EnsembleVoter', 'ConfidenceScorer', 'Prediction']
\ No newline at end of file
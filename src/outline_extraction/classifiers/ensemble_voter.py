@@ -2,12 +2,17 @@
 import logging
 from typing import List, Dict
 from collections import defaultdict
+from operator import itemgetter
 
 from .hierarchy_classifier import HierarchyClassifier
 from .confidence_scorer import ConfidenceScorer
+from .prediction import Prediction
 
 logger = logging.getLogger(__name__)
 
+# Fields every strategy prediction carries (filled in by HeadingDetector)
+_prediction_fields = itemgetter('block_id', 'is_heading', 'level', 'confidence')
+
 class EnsembleVoter:
     """Ensemble voting for heading detection"""
     
@@ -29,7 +34,7 @@ class EnsembleVoter:
     
     def vote(self, strategy_predictions: Dict[str, List[Dict]], 
             blocks: List[Dict] = None,
-            weights: Dict[str, float] = None) -> List[Dict]:
+            weights: Dict[str, float] = None) -> List[Prediction]:
         """Perform ensemble voting on strategy predictions"""
         
         if not strategy_predictions:
@@ -42,6 +47,12 @@ class EnsembleVoter:
         first_strategy = next(iter(strategy_predictions.values()))
         num_blocks = len(first_strategy)
         
+        # Resolve each strategy's weight once rather than per block
+        weighted_strategies = [
+            (predictions, weights.get(strategy_name, 0.1))
+            for strategy_name, predictions in strategy_predictions.items()
+        ]
+        
         # Initialize final predictions
         final_predictions = []
         
@@ -58,20 +69,20 @@ class EnsembleVoter:
             
             block_id = None
             
-            for strategy_name, predictions in strategy_predictions.items():
+            for predictions, weight in weighted_strategies:
                 if block_idx >= len(predictions):
                     continue
                 
                 pred = predictions[block_idx]
-                weight = weights.get(strategy_name, 0.1)
+                pred_block_id, pred_is_heading, pred_level, pred_confidence = _prediction_fields(pred)
                 
                 # Get block ID
                 if block_id is None:
-                    block_id = pred.get('block_id')
+                    block_id = pred_block_id
                 
                 # Vote on heading/not heading
-                if pred.get('is_heading', False):
-                    votes['is_heading'] += weight * pred.get('confidence', 1.0)
+                if pred_is_heading:
+                    votes['is_heading'] += weight * pred_confidence
                     
                     # Check if this strategy has text override and higher weight
                     if pred.get('text') and weight > votes['best_text_weight']:
@@ -79,12 +90,12 @@ class EnsembleVoter:
                         votes['best_text_weight'] = weight
                     
                     # Vote on level if provided
-                    if pred.get('level'):
-                        votes['levels'][pred['level']] += weight * pred.get('confidence', 1.0)
+                    if pred_level:
+                        votes['levels'][pred_level] += weight * pred_confidence
                 else:
-                    votes['not_heading'] += weight * (1.0 - pred.get('confidence', 0.0))
+                    votes['not_heading'] += weight * (1.0 - pred_confidence)
                 
-                votes['confidences'].append(pred.get('confidence', 0.0))
+                votes['confidences'].append(pred_confidence)
             
             # Make final decision
             is_heading = votes['is_heading'] > votes['not_heading']
@@ -99,35 +110,32 @@ class EnsembleVoter:
                 votes, strategy_predictions, block_idx
             )
             
-            final_prediction = {
-                'block_id': block_id,
-                'is_heading': is_heading,
-                'level': level,
-                'confidence': confidence,
-                'vote_details': {
+            final_prediction = Prediction(
+                block_id=block_id,
+                is_heading=is_heading,
+                level=level,
+                confidence=confidence,
+                text=votes['text_override'] or None,
+                vote_details={
                     'heading_score': votes['is_heading'],
                     'not_heading_score': votes['not_heading'],
                     'level_votes': dict(votes['levels'])
                 }
-            }
-            
-            # Add text override if available
-            if votes['text_override']:
-                final_prediction['text'] = votes['text_override']
+            )
                 
             final_predictions.append(final_prediction)
         # Post-process: classify hierarchy levels
         if blocks:
-            headings = [p for p in final_predictions if p['is_heading']]
+            headings = [p for p in final_predictions if p.is_heading]
             if headings:
                 # Re-classify levels based on ensemble results
                 classified_headings = self.hierarchy_classifier.classify(headings, blocks)
                 
                 # Update final predictions with classified levels
-                heading_map = {h['block_id']: h for h in classified_headings}
+                heading_map = {h.block_id: h for h in classified_headings}
                 
                 for pred in final_predictions:
-                    if pred['block_id'] in heading_map:
-                        pred['level'] = heading_map[pred['block_id']]['level']
+                    if pred.block_id in heading_map:
+                        pred.level = heading_map[pred.block_id].level
         
         return final_predictions
\ No newline at end of file
@@ -3,6 +3,8 @@ import re
 from typing import List, Dict, Tuple
 from collections import Counter
 
+from .prediction import Prediction
+
 class HierarchyClassifier:
     """Classify heading hierarchy levels"""
     
@@ -23,7 +25,7 @@ class HierarchyClassifier:
             ]
         }
     
-    def classify(self, headings: List[Dict], blocks: List[Dict]) -> List[Dict]:
+    def classify(self, headings: List[Prediction], blocks: List[Dict]) -> List[Prediction]:
         """Classify heading levels based on multiple factors"""
         if not headings:
             return headings
@@ -31,7 +33,7 @@ class HierarchyClassifier:
         # Extract heading blocks
         heading_blocks = []
         for h in headings:
-            block = next((b for b in blocks if b['id'] == h['block_id']), None)
+            block = next((b for b in blocks if b['id'] == h.block_id), None)
             if block:
                 heading_blocks.append({
                     'heading': h,
@@ -57,10 +59,10 @@ class HierarchyClassifier:
             # Vote on final level
             if levels:
                 level_counter = Counter(levels)
-                hb['heading']['level'] = level_counter.most_common(1)[0][0]
+                hb['heading'].level = level_counter.most_common(1)[0][0]
             else:
                 # Default to H2
-                hb['heading']['level'] = 'H2'
+                hb['heading'].level = 'H2'
         
         return [hb['heading'] for hb in heading_blocks]
     
@@ -0,0 +1,15 @@
+# src/outline_extraction/classifiers/prediction.py
+from dataclasses import dataclass
+from typing import Dict, Optional, Any
+
+@dataclass
+class Prediction:
+    """Final heading prediction produced by ensemble voting"""
+    __slots__ = ('block_id', 'is_heading', 'level', 'confidence', 'text', 'vote_details')
+
+    block_id: Optional[int]
+    is_heading: bool
+    level: Optional[str]
+    confidence: float
+    text: Optional[str]
+    vote_details: Dict[str, Any]
@@ -1,6 +1,7 @@
 # src/outline_extraction/detectors/heading_detector.py
 import logging
 from typing import List, Dict, Any
+from operator import itemgetter
 
 from ..strategies import (
     FontStrategy, EnhancedFontStrategy, PatternStrategy, MLStrategy, 
@@ -75,14 +76,27 @@ class HeadingDetector:
                     
                     all_predictions[name] = mapped_predictions
                 
-                logger.debug(f"{name} strategy detected {sum(1 for p in all_predictions[name] if p['is_heading'])} headings")
+                self._fill_prediction_defaults(all_predictions[name])
+                
+                if logger.isEnabledFor(logging.DEBUG):
+                    heading_count = sum(map(itemgetter('is_heading'), all_predictions[name]))
+                    logger.debug(f"{name} strategy detected {heading_count} headings")
             except Exception as e:
                 logger.error(f"Strategy {name} failed: {str(e)}")
                 all_predictions[name] = []
         
         return all_predictions
-        
-        return all_predictions
+    
+    def _fill_prediction_defaults(self, predictions: List[Dict]) -> None:
+        """Ensure every prediction carries the fields the voter unpacks"""
+        for pred in predictions:
+            pred.setdefault('block_id', None)
+            pred.setdefault('is_heading', False)
+            pred.setdefault('level', None)
+            # The voter used to count a heading vote without a confidence as
+            # fully confident, and any other vote as zero
+            if 'confidence' not in pred:
+                pred['confidence'] = 1.0 if pred['is_heading'] else 0.0
     
     def _filter_candidates(self, blocks: List[Dict]) -> List[Dict]:
         """Filter blocks that could potentially be headings"""
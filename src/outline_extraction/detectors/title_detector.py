@@ -30,8 +30,20 @@ class TitleDetector:
                 'confidence': 0.9
             }
         
-        # Look for title in first page blocks
-        first_page_blocks = [b for b in blocks if b.get('page', 1) == 1]
+        # Look for title in first page blocks. Blocks arrive in page order
+        # from the extractors, so stop at the first block past page 1 and
+        # track the largest block on the way for the fallback below.
+        first_page_blocks = []
+        largest_block = None
+        largest_size = 0
+        for block in blocks:
+            if block.get('page', 1) != 1:
+                break
+            first_page_blocks.append(block)
+            size = block.get('font_size', 0)
+            if largest_block is None or size > largest_size:
+                largest_block = block
+                largest_size = size
         
         if not first_page_blocks:
             return None
@@ -59,9 +71,6 @@ class TitleDetector:
             }
         
         # Fallback: largest text on first page
-        largest_block = max(first_page_blocks, 
-                          key=lambda b: b.get('font_size', 0))
-        
         return {
             'text': largest_block['text'].strip(),
             'source': 'fallback',
@@ -1,25 +1,46 @@
 # src/outline_extraction/detectors/toc_detector.py
 import re
+import regex
 import logging
+from functools import lru_cache
+from itertools import islice
 from typing import List, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Leading section number such as "2" or "2.1.3"
+_SECTION_NUMBER = re.compile(r'(\d+(?:\.\d+)*)')
+
+# All entry patterns and all header patterns combined into a single
+# alternation each, so a block is scanned once instead of once per pattern.
+# Alternatives are tried in list order, which preserves the first-match-wins
+# behaviour of the individual patterns. The entry patterns use possessive
+# quantifiers (via the `regex` module) on runs that can never give characters
+# back - whitespace, leader dots and page digits are disjoint classes - so a
+# failed match cannot backtrack through them.
+_DOTS_ENTRY = r'(?:(?P<dots_title>.+?)\s*+\.{3,}+\s*+(?P<dots_page>\d++)\s*+$)'
+_PLAIN_ENTRIES = (
+    r'(?:(?P<plain_title>.+?)\s++(?P<plain_page>\d++)\s*+$)'
+    r'|(?:(?P<number>\d++\.?+\d*+)\s++(?P<numbered_title>.+?)\s++(?P<numbered_page>\d++)$)'
+)
+_ENTRY_PATTERN = regex.compile(_DOTS_ENTRY + '|' + _PLAIN_ENTRIES)
+# Without a dotted leader the first alternative can never match
+_PLAIN_ENTRY_PATTERN = regex.compile(_PLAIN_ENTRIES)
+_HEADER_PATTERN = re.compile(r'table\s+of\s+contents|contents|index', re.I)
+
 class TOCDetector:
     """Detect and parse table of contents"""
     
     def __init__(self):
-        self.toc_patterns = [
-            # Page number patterns
-            re.compile(r'(.+?)\s*\.{3,}\s*(\d+)\s*$'),  # Title ... 123
-            re.compile(r'(.+?)\s+(\d+)\s*$'),           # Title 123
-            re.compile(r'^(\d+\.?\d*)\s+(.+?)\s+(\d+)$'), # 1.2 Title 123
-            
-            # TOC headers
-            re.compile(r'table\s+of\s+contents', re.I),
-            re.compile(r'contents', re.I),
-            re.compile(r'index', re.I)
-        ]
+        self._entry_pattern = _ENTRY_PATTERN
+        self._plain_entry_pattern = _PLAIN_ENTRY_PATTERN
+        self._header_pattern = _HEADER_PATTERN
+        
+        # Memoize entry matching and level detection by text: running
+        # headers, footers and TOC lines repeat across pages. Entry matches
+        # are cached as tuples so callers still get fresh dicts.
+        self._match_entry = lru_cache(maxsize=4096)(self._match_entry)
+        self._detect_level = lru_cache(maxsize=4096)(self._detect_level)
     
     def detect(self, blocks: List[Dict]) -> Optional[Dict]:
         """Detect table of contents in document"""
@@ -48,12 +69,13 @@ class TOCDetector:
     
     def _find_toc_header(self, blocks: List[Dict]) -> Optional[int]:
         """Find TOC header block"""
-        for i, block in enumerate(blocks[:50]):  # Check first 50 blocks
+        search_header = self._header_pattern.search
+        
+        for i, block in enumerate(islice(blocks, 50)):  # Check first 50 blocks
             text = block.get('text', '').strip().lower()
             
-            for pattern in self.toc_patterns[-3:]:  # Header patterns
-                if pattern.search(text):
-                    return i
+            if search_header(text):
+                return i
         
         return None
     
@@ -61,33 +83,23 @@ class TOCDetector:
         """Detect TOC entries by pattern matching"""
         entries = []
         consecutive_matches = 0
+        match_entry = self._match_entry
+        detect_level = self._detect_level
         
-        for block in blocks[:100]:  # Check first 100 blocks
+        for block in islice(blocks, 100):  # Check first 100 blocks
             text = block.get('text', '').strip()
             
             # Try to match TOC patterns
-            for pattern in self.toc_patterns[:-3]:  # Entry patterns
-                match = pattern.match(text)
-                if match:
-                    if len(match.groups()) == 2:
-                        title, page = match.groups()
-                    else:
-                        # Handle numbered entries
-                        number, title, page = match.groups()
-                        title = f"{number} {title}"
-                    
-                    try:
-                        page_num = int(page)
-                        entries.append({
-                            'title': title.strip(),
-                            'page': page_num,
-                            'block_id': block.get('id'),
-                            'level': self._detect_level(title)
-                        })
-                        consecutive_matches += 1
-                        break
-                    except ValueError:
-                        pass
+            entry = match_entry(text)
+            if entry:
+                title, page_num = entry
+                entries.append({
+                    'title': title.strip(),
+                    'page': page_num,
+                    'block_id': block.get('id'),
+                    'level': detect_level(title)
+                })
+                consecutive_matches += 1
             else:
                 # No match
                 if consecutive_matches > 3:
@@ -119,34 +131,49 @@ class TOCDetector:
     
     def _parse_toc_entry(self, text: str) -> Optional[Dict]:
         """Parse a single TOC entry"""
-        # Try each pattern
-        for pattern in self.toc_patterns[:-3]:
-            match = pattern.match(text)
-            if match:
-                try:
-                    if len(match.groups()) == 2:
-                        title, page = match.groups()
-                    else:
-                        number, title, page = match.groups()
-                        title = f"{number} {title}"
-                    
-                    page_num = int(page)
-                    return {
-                        'title': title.strip(),
-                        'page': page_num,
-                        'level': self._detect_level(title)
-                    }
-                except (ValueError, IndexError):
-                    continue
+        entry = self._match_entry(text)
+        if entry:
+            title, page_num = entry
+            return {
+                'title': title.strip(),
+                'page': page_num,
+                'level': self._detect_level(title)
+            }
         
         return None
     
+    def _match_entry(self, text: str) -> Optional[Tuple[str, int]]:
+        """Match text against the combined entry pattern, returning (title, page)"""
+        # Every entry pattern ends in a page number, so anything else is
+        # rejected before touching a regex; the dotted-leader alternative is
+        # only tried when the text actually contains a leader.
+        stripped = text.rstrip()
+        if not stripped or not stripped[-1].isdigit():
+            return None
+        
+        if '...' in text:
+            match = self._entry_pattern.match(text)
+        else:
+            match = self._plain_entry_pattern.match(text)
+        if not match:
+            return None
+        
+        kind = match.lastgroup
+        if kind == 'dots_page':
+            return match.group('dots_title'), int(match.group('dots_page'))
+        if kind == 'plain_page':
+            return match.group('plain_title'), int(match.group('plain_page'))
+        
+        # Handle numbered entries
+        title = f"{match.group('number')} {match.group('numbered_title')}"
+        return title, int(match.group('numbered_page'))
+    
     def _detect_level(self, title: str) -> str:
         """Detect heading level from TOC entry"""
-        # Count leading numbers/dots to determine level
-        match = re.match(r'^(\d+(?:\.\d+)*)', title)
-        if match:
-            number = match.group(1)
+        # Count leading numbers/dots to determine level; most titles do not
+        # start with a digit, so the regex only runs when one could match
+        if title[:1].isdecimal():
+            number = _SECTION_NUMBER.match(title).group(1)
             depth = number.count('.') + 1
             
             if depth == 1:
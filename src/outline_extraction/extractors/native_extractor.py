@@ -1,13 +1,40 @@
 # src/outline_extraction/extractors/native_extractor.py
 import fitz  # PyMuPDF
+import sys
 import logging
+import numpy as np
 from typing import List, Dict, Any
-from collections import defaultdict
+from collections import defaultdict, Counter
+from operator import itemgetter
 
 from .base_extractor import BaseExtractor
 
 logger = logging.getLogger(__name__)
 
+def _assign_merge_groups(pages, xs, ys, heights, merge_threshold, x_threshold):
+    """Assign a merge group to each block in reading order.
+    
+    A block joins the previous block's group when it is on the same page,
+    starts within merge_threshold of the previous block's bottom edge and
+    is horizontally aligned with the first block of the group.
+    """
+    n = len(pages)
+    groups = np.zeros(n, dtype=np.int64)
+    group = 0
+    anchor_x = xs[0]
+    
+    for i in range(1, n):
+        if (pages[i] == pages[i - 1] and
+                abs(ys[i] - (ys[i - 1] + heights[i - 1])) < merge_threshold and
+                abs(xs[i] - anchor_x) < x_threshold):  # Similar horizontal position
+            groups[i] = group
+        else:
+            group += 1
+            anchor_x = xs[i]
+            groups[i] = group
+    
+    return groups
+
 class NativeExtractor(BaseExtractor):
     """Extract text from native PDF using PyMuPDF"""
     
@@ -67,44 +94,48 @@ class NativeExtractor(BaseExtractor):
             if block_info and len(block_info['text']) >= self.min_text_length:
                 blocks.append(block_info)
         
+        # Reading order within the page; pages themselves are visited in
+        # order, so the document-level block list comes out fully sorted
+        blocks.sort(key=itemgetter('y', 'x'))
+        
         return blocks
     
     def _process_block(self, block: Dict, page_num: int) -> Dict:
         """Process a single block"""
-        text = ""
+        text_parts = []
         fonts = []
         sizes = []
-        flags = []
+        is_bold = False
+        is_italic = False
         
         for line in block.get("lines", []):
-            line_text = ""
             for span in line.get("spans", []):
                 span_text = span.get("text", "")
-                line_text += span_text
+                text_parts.append(span_text)
                 
                 if span_text.strip():
                     fonts.append(span.get("font", ""))
                     sizes.append(span.get("size", 0))
-                    flags.append(span.get("flags", 0))
-            
-            text += line_text
+                    flag = span.get("flags", 0)
+                    is_bold = is_bold or bool(flag & 2**4)
+                    is_italic = is_italic or bool(flag & 2**1)
         
-        if not text.strip():
+        text = ''.join(text_parts).strip()
+        if not text:
             return None
         
         # Calculate average font properties
         avg_size = sum(sizes) / len(sizes) if sizes else 0
-        is_bold = any(flag & 2**4 for flag in flags) if flags else False
-        is_italic = any(flag & 2**1 for flag in flags) if flags else False
         
-        # Get most common font
-        font = max(set(fonts), key=fonts.count) if fonts else ""
+        # Get most common font; interned so blocks in the same font share
+        # one string instead of holding a copy each
+        font = sys.intern(Counter(fonts).most_common(1)[0][0]) if fonts else ""
         
         # Ensure bbox is a list (mutable) not a tuple
         bbox = list(block.get("bbox", [0, 0, 0, 0]))
         
         return {
-            'text': text.strip(),
+            'text': text,
             'page': page_num,
             'bbox': bbox,
             'x': bbox[0],
@@ -116,7 +147,7 @@ class NativeExtractor(BaseExtractor):
             'is_bold': is_bold,
             'is_italic': is_italic,
             'line_count': len(block.get("lines", [])),
-            'char_count': len(text.strip())
+            'char_count': len(text)
         }
     
     def _merge_nearby_blocks(self, blocks: List[Dict]) -> List[Dict]:
@@ -124,31 +155,36 @@ class NativeExtractor(BaseExtractor):
         if not blocks:
             return blocks
         
-        # Sort blocks by page and vertical position
-        blocks.sort(key=lambda b: (b['page'], b['y']))
+        # Blocks are already sorted by page and position (see _extract_page_blocks)
+        n = len(blocks)
+        pages = np.fromiter((b['page'] for b in blocks), dtype=np.int64, count=n)
+        xs = np.fromiter((b['x'] for b in blocks), dtype=np.float64, count=n)
+        ys = np.fromiter((b['y'] for b in blocks), dtype=np.float64, count=n)
+        heights = np.fromiter((b['height'] for b in blocks), dtype=np.float64, count=n)
+        
+        groups = _assign_merge_groups(pages, xs, ys, heights, self.merge_threshold, 50)
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        ends = np.r_[starts[1:], n]
         
         merged = []
-        current = blocks[0]
         
-        for block in blocks[1:]:
-            if (block['page'] == current['page'] and 
-                abs(block['y'] - (current['y'] + current['height'])) < self.merge_threshold and
-                abs(block['x'] - current['x']) < 50):  # Similar horizontal position
-                
-                # Merge blocks
-                current['text'] += ' ' + block['text']
-                current['height'] = block['y'] + block['height'] - current['y']
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            current = blocks[start]
+            
+            if end - start > 1:
+                # Merge the group into its first block
+                group = blocks[start:end]
+                last = group[-1]
+                current['text'] = ' '.join(b['text'] for b in group)
+                current['height'] = last['y'] + last['height'] - current['y']
                 # Ensure bbox is mutable list before assignment
                 if isinstance(current['bbox'], tuple):
                     current['bbox'] = list(current['bbox'])
-                current['bbox'][3] = block['bbox'][3]
-                current['line_count'] += block['line_count']
+                current['bbox'][3] = last['bbox'][3]
+                current['line_count'] = sum(b['line_count'] for b in group)
                 current['char_count'] = len(current['text'])
-            else:
-                merged.append(current)
-                current = block
-        
-        merged.append(current)
+            
+            merged.append(current)
         
         # Re-assign IDs
         for i, block in enumerate(merged):
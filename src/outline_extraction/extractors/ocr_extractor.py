@@ -4,10 +4,22 @@ import numpy as np
 import pytesseract
 import fitz
 import logging
-from typing import List, Dict, Any
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Optional
 from PIL import Image
 
 from .base_extractor import BaseExtractor
+from config.settings import MAX_WORKERS
+
+# tesserocr drives libtesseract in-process; without it we fall back to the
+# pytesseract CLI wrapper (one subprocess + TSV parse per page)
+try:
+    from tesserocr import PyTessBaseAPI, RIL, PSM, iterate_level, get_languages
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -17,52 +29,83 @@ class OCRExtractor(BaseExtractor):
     def __init__(self):
         self.dpi = 300
         self.preprocessing = True
+        self.skew_detection_scale = 0.5  # Deskew analysis runs at half resolution
         self.lang = 'eng'
         # Configure tesseract path for Windows
         pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+        # Idle tesserocr engines, kept across extract() calls: loading one is
+        # the expensive part, and each engine serves one page at a time
+        self._apis = queue.SimpleQueue()
         self.tesseract_available = self._check_tesseract()
     
-    def extract(self, pdf_path: str, **kwargs) -> List[Dict[str, Any]]:
-        """Extract text blocks using OCR"""
+    def extract(self, pdf_path: str, pages: Optional[Iterable[int]] = None,
+               **kwargs) -> List[Dict[str, Any]]:
+        """Extract text blocks using OCR, optionally only from the given 1-based pages"""
         if not self.tesseract_available:
             logger.warning("Tesseract not available, skipping OCR extraction")
             return []
             
         try:
             doc = fitz.open(pdf_path)
+            page_results = []
+            pending = deque()
+            
+            if pages is None:
+                page_numbers = range(1, len(doc) + 1)
+            else:
+                page_numbers = sorted(p for p in set(pages) if 1 <= p <= len(doc))
+            
+            # PyMuPDF is not thread-safe, so pages are rendered here on the
+            # calling thread; preprocessing and tesseract (which release the
+            # GIL / run out of process) are spread over a thread pool. The
+            # number of rendered pages in flight is bounded to cap memory.
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                for page_num in page_numbers:
+                    img = self._render_page(doc[page_num - 1])
+                    pending.append(executor.submit(self._ocr_page_image, img, page_num))
+                    
+                    if len(pending) >= 2 * MAX_WORKERS:
+                        page_results.append(pending.popleft().result())
+                
+                page_results.extend(future.result() for future in pending)
+            
+            doc.close()
+            
             blocks = []
             block_id = 0
             
-            for page_num, page in enumerate(doc):
-                # Convert page to image
-                mat = fitz.Matrix(self.dpi/72, self.dpi/72)
-                pix = page.get_pixmap(matrix=mat)
-                img_data = pix.tobytes("png")
-                
-                # Convert to numpy array
-                nparr = np.frombuffer(img_data, np.uint8)
-                img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-                
-                # Preprocess if needed
-                if self.preprocessing:
-                    img = self._preprocess_image(img)
-                
-                # Extract text with layout information
-                page_blocks = self._extract_with_layout(img, page_num + 1)
-                
+            for page_blocks in page_results:
                 for block in page_blocks:
                     block['id'] = block_id
                     block['source'] = 'ocr'
                     blocks.append(block)
                     block_id += 1
             
-            doc.close()
             return blocks
             
         except Exception as e:
             logger.error(f"OCR extraction failed: {str(e)}")
             return []
     
+    def _render_page(self, page: fitz.Page) -> np.ndarray:
+        """Rasterize a page for OCR"""
+        # Render straight to 8-bit grayscale; the raw samples buffer is used
+        # as-is, with no PNG encode/decode round-trip
+        mat = fitz.Matrix(self.dpi/72, self.dpi/72)
+        pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+        
+        img = np.frombuffer(pix.samples, dtype=np.uint8)
+        return img.reshape(pix.height, pix.stride)[:, :pix.width]
+    
+    def _ocr_page_image(self, img: np.ndarray, page_num: int) -> List[Dict]:
+        """Preprocess and OCR a rendered page"""
+        # Preprocess if needed
+        if self.preprocessing:
+            img = self._preprocess_image(img)
+        
+        # Extract text with layout information
+        return self._extract_with_layout(img, page_num)
+    
     def can_handle(self, pdf_path: str) -> bool:
         """Check if OCR is needed"""
         if not self.tesseract_available:
@@ -89,8 +132,8 @@ class OCRExtractor(BaseExtractor):
     
     def _preprocess_image(self, img: np.ndarray) -> np.ndarray:
         """Preprocess image for better OCR"""
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        # Pages are rendered as grayscale already
+        gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         
         # Apply thresholding
         _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
@@ -107,8 +150,12 @@ class OCRExtractor(BaseExtractor):
     
     def _get_skew_angle(self, img: np.ndarray) -> float:
         """Detect skew angle"""
-        edges = cv2.Canny(img, 50, 150, apertureSize=3)
-        lines = cv2.HoughLines(edges, 1, np.pi/180, 200)
+        # Line orientation survives downscaling, and Canny + Hough cost scales
+        # with pixel count; the vote threshold shrinks with line length
+        scale = self.skew_detection_scale
+        small = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        edges = cv2.Canny(small, 50, 150, apertureSize=3)
+        lines = cv2.HoughLines(edges, 1, np.pi/180, int(200 * scale))
         
         if lines is not None:
             angles = []
@@ -138,67 +185,129 @@ class OCRExtractor(BaseExtractor):
     def _extract_with_layout(self, img: np.ndarray, page_num: int) -> List[Dict]:
         """Extract text with layout preservation"""
         # Get OCR data with bounding boxes
-        data = pytesseract.image_to_data(img, lang=self.lang, 
-                                        output_type=pytesseract.Output.DICT)
+        data = self._ocr_words(img)
         
-        blocks = []
-        current_block = None
+        texts = data['text']
         
-        n_boxes = len(data['text'])
+        # Skip empty text
+        kept = np.flatnonzero(np.fromiter(
+            (bool(t.strip()) for t in texts), dtype=bool, count=len(texts)
+        ))
+        if kept.size == 0:
+            return []
         
-        for i in range(n_boxes):
-            # Skip empty text
-            if not data['text'][i].strip():
-                continue
-            
-            # Check if this is a new block
-            if data['block_num'][i] != (current_block['block_num'] if current_block else -1):
-                # Save previous block
-                if current_block and current_block['text'].strip():
-                    blocks.append(current_block)
-                
-                # Start new block
-                current_block = {
-                    'text': data['text'][i],
-                    'page': page_num,
-                    'x': data['left'][i],
-                    'y': data['top'][i],
-                    'width': data['width'][i],
-                    'height': data['height'][i],
-                    'bbox': [data['left'][i], data['top'][i], 
-                            data['left'][i] + data['width'][i], 
-                            data['top'][i] + data['height'][i]],
-                    'confidence': data['conf'][i],
-                    'block_num': data['block_num'][i],
-                    'font_size': self._estimate_font_size(data['height'][i]),
-                    'is_bold': False,  # OCR doesn't provide this
-                    'is_italic': False,
-                    'line_count': 1,
-                    'char_count': len(data['text'][i])
-                }
-            else:
-                # Append to current block
-                current_block['text'] += ' ' + data['text'][i]
-                current_block['width'] = max(current_block['width'], 
-                                            data['left'][i] + data['width'][i] - current_block['x'])
-                current_block['height'] = max(current_block['height'],
-                                            data['top'][i] + data['height'][i] - current_block['y'])
-                current_block['bbox'][2] = max(current_block['bbox'][2], 
-                                              data['left'][i] + data['width'][i])
-                current_block['bbox'][3] = max(current_block['bbox'][3],
-                                              data['top'][i] + data['height'][i])
-                current_block['confidence'] = min(current_block['confidence'], data['conf'][i])
-                current_block['char_count'] = len(current_block['text'])
-        
-        # Don't forget the last block
-        if current_block and current_block['text'].strip():
-            blocks.append(current_block)
+        # Column arrays for the kept tokens
+        lefts = np.asarray(data['left'])[kept]
+        tops = np.asarray(data['top'])[kept]
+        rights = lefts + np.asarray(data['width'])[kept]
+        bottoms = tops + np.asarray(data['height'])[kept]
+        heights = np.asarray(data['height'])[kept]
+        confs = np.asarray(data['conf'])[kept]
+        block_nums = np.asarray(data['block_num'])[kept]
+        
+        # A new block starts wherever block_num changes between consecutive tokens
+        starts = np.flatnonzero(np.r_[True, block_nums[1:] != block_nums[:-1]])
+        ends = np.r_[starts[1:], kept.size]
+        
+        # Blocks are anchored at their first token and grow to cover the rest
+        xs = lefts[starts].tolist()
+        ys = tops[starts].tolist()
+        x2s = np.maximum.reduceat(rights, starts).tolist()
+        y2s = np.maximum.reduceat(bottoms, starts).tolist()
+        first_heights = heights[starts].tolist()
+        min_confs = np.minimum.reduceat(confs, starts).tolist()
+        
+        kept_texts = [texts[i] for i in kept.tolist()]
+        blocks = []
+        
+        for g, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+            text = ' '.join(kept_texts[start:end])
+            x, y, x2, y2 = xs[g], ys[g], x2s[g], y2s[g]
+            blocks.append({
+                'text': text,
+                'page': page_num,
+                'x': x,
+                'y': y,
+                'width': x2 - x,
+                'height': y2 - y,
+                'bbox': [x, y, x2, y2],
+                'confidence': min_confs[g],
+                'font_size': self._estimate_font_size(first_heights[g]),
+                'is_bold': False,  # OCR doesn't provide this
+                'is_italic': False,
+                'line_count': 1,
+                'char_count': len(text)
+            })
         
         # Filter low confidence blocks
         blocks = [b for b in blocks if b['confidence'] > 30]
         
         return blocks
     
+    def _ocr_words(self, img: np.ndarray) -> Dict[str, list]:
+        """Run OCR and return word-level columns in pytesseract's DICT layout"""
+        image = self._to_ocr_image(img)
+        
+        api = self._acquire_api() if TESSEROCR_AVAILABLE else None
+        if api is None:
+            return pytesseract.image_to_data(image, lang=self.lang, 
+                                            output_type=pytesseract.Output.DICT)
+        
+        try:
+            return self._recognize_words(api, image)
+        finally:
+            self._apis.put(api)
+    
+    def _recognize_words(self, api, image: Image.Image) -> Dict[str, list]:
+        """Recognize a page with a tesserocr engine into word-level columns"""
+        data = {'text': [], 'left': [], 'top': [], 'width': [], 'height': [],
+                'conf': [], 'block_num': []}
+        
+        api.SetImage(image)
+        api.Recognize()
+        
+        block_num = 0
+        for word in iterate_level(api.GetIterator(), RIL.WORD):
+            if word.IsAtBeginningOf(RIL.BLOCK):
+                block_num += 1
+            
+            box = word.BoundingBox(RIL.WORD)
+            if box is None:
+                continue
+            left, top, right, bottom = box
+            
+            data['text'].append(word.GetUTF8Text(RIL.WORD) or '')
+            data['left'].append(left)
+            data['top'].append(top)
+            data['width'].append(right - left)
+            data['height'].append(bottom - top)
+            data['conf'].append(word.Confidence(RIL.WORD))
+            data['block_num'].append(block_num)
+        
+        return data
+    
+    def _to_ocr_image(self, img: np.ndarray) -> Image.Image:
+        """Hand tesseract the smallest image that carries the page"""
+        image = Image.fromarray(img.astype(np.uint8, copy=False))
+        if self.preprocessing:
+            # Preprocessed pages are already binarized (deskew interpolation
+            # only softens edges), so pack them to 1 bit per pixel
+            image = image.point(lambda v: 255 if v >= 128 else 0, mode='1')
+        return image
+    
+    def _acquire_api(self):
+        """Take an idle tesserocr engine, creating one when all are in use"""
+        try:
+            return self._apis.get_nowait()
+        except queue.Empty:
+            pass
+        
+        try:
+            return PyTessBaseAPI(lang=self.lang, psm=PSM.AUTO)
+        except RuntimeError as e:
+            logger.warning(f"tesserocr unavailable, using pytesseract: {e}")
+            return None
+    
     def _estimate_font_size(self, height: int) -> float:
         """Estimate font size from text height in pixels"""
         # Rough estimation: height in pixels to points
@@ -207,6 +316,14 @@ class OCRExtractor(BaseExtractor):
     
     def _check_tesseract(self) -> bool:
         """Check if Tesseract is available"""
+        # Look for the language data rather than loading an engine
+        if TESSEROCR_AVAILABLE:
+            try:
+                if self.lang in get_languages()[1]:
+                    return True
+            except RuntimeError:
+                pass
+        
         try:
             pytesseract.get_tesseract_version()
             return True
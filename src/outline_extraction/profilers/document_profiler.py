@@ -1,15 +1,51 @@
 # src/outline_extraction/profilers/document_profiler.py
 import fitz
+import os
 import re
+import copy
+import numpy as np
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Set
 from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
+
+# pyahocorasick is optional: without it keywords are matched with substring checks
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 from .layout_analyzer import LayoutAnalyzer
 from .ocr_detector import OCRDetector
+from .page_cache import build_page_cache
 
 logger = logging.getLogger(__name__)
 
+# Script codepoint ranges checked in order by _detect_language
+_LANGUAGE_RANGES = (
+    ('chinese', ((0x4e00, 0x9fff),)),
+    ('japanese', ((0x3040, 0x309f), (0x30a0, 0x30ff))),
+    ('arabic', ((0x0600, 0x06ff),)),
+    ('russian', ((0x0400, 0x04ff),)),  # Cyrillic
+)
+_MIN_SCRIPT_CODEPOINT = 0x0400
+
+# Keys of fitz.Document.metadata, paired with the lowercased profile keys
+_METADATA_KEYS = tuple((key, key.lower()) for key in (
+    'format', 'title', 'author', 'subject', 'keywords', 'creator',
+    'producer', 'creationDate', 'modDate', 'trapped', 'encryption'
+))
+
+_TOC_PATTERNS = tuple(re.compile(pattern, re.I | re.M) for pattern in (
+    r'table\s+of\s+contents',
+    r'contents\s*\n',
+    r'^\s*\d+\.\s+.+\s+\d+\s*$',  # Pattern like "1. Introduction ... 5"
+    r'chapter\s+\d+.*page\s+\d+',
+    r'\.{3,}\s*\d+\s*$'  # Dots followed by page number
+))
+
 class DocumentProfiler:
     """Profile document to determine best extraction strategy"""
     
@@ -21,25 +57,25 @@ class DocumentProfiler:
             'academic': {
                 'keywords': ['abstract', 'introduction', 'methodology', 'results', 
                            'discussion', 'conclusion', 'references', 'bibliography'],
-                'patterns': [r'doi:\s*\S+', r'ISSN\s*\d{4}-\d{4}', r'Vol\.\s*\d+'],
+                'patterns': [r'doi:\s*\S+', r'issn\s*\d{4}-\d{4}', r'vol\.\s*\d+'],
                 'weight': 1.0
             },
             'business': {
                 'keywords': ['executive summary', 'financial', 'revenue', 'profit',
                            'growth', 'strategy', 'market', 'quarterly', 'annual report'],
-                'patterns': [r'Q[1-4]\s+20\d{2}', r'\$[\d,]+(?:\.\d{2})?[MBK]?'],
+                'patterns': [r'q[1-4]\s+20\d{2}', r'\$[\d,]+(?:\.\d{2})?[mbk]?'],
                 'weight': 1.0
             },
             'technical': {
                 'keywords': ['specification', 'requirements', 'implementation', 
                            'architecture', 'design', 'api', 'documentation'],
-                'patterns': [r'v\d+\.\d+', r'RFC\s*\d+'],
+                'patterns': [r'v\d+\.\d+', r'rfc\s*\d+'],
                 'weight': 1.0
             },
             'book': {
                 'keywords': ['chapter', 'contents', 'preface', 'epilogue', 
                            'appendix', 'glossary', 'index'],
-                'patterns': [r'Chapter\s+\d+', r'ISBN[-\s]*([\d-]+)'],
+                'patterns': [r'chapter\s+\d+', r'isbn[-\s]*([\d-]+)'],
                 'weight': 1.0
             },
             'form': {
@@ -49,59 +85,85 @@ class DocumentProfiler:
                 'weight': 0.8
             }
         }
+        
+        # Compile indicator patterns once. They are written in lowercase and
+        # matched against lowercased sample text, so no re.I is needed.
+        for indicators in self.type_indicators.values():
+            indicators['patterns'] = [re.compile(pattern) for pattern in indicators['patterns']]
+        
+        self.keywords = {keyword for indicators in self.type_indicators.values()
+                         for keyword in indicators['keywords']}
+        self.keyword_automaton = None
+        if AHOCORASICK_AVAILABLE:
+            self.keyword_automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self.keyword_automaton.add_word(keyword, keyword)
+            self.keyword_automaton.make_automaton()
+        
+        # Memoize profiles per file version: batch runs re-profile the same
+        # PDFs. Failures raise inside the cached call, so they are not cached.
+        self._profile_file = lru_cache(maxsize=256)(self._profile_file)
     
     def profile(self, pdf_path: str) -> Dict[str, Any]:
         """Create comprehensive document profile"""
         try:
-            doc = fitz.open(pdf_path)
-            
-            profile = {
-                'path': pdf_path,
-                'page_count': len(doc),
-                'type': self._detect_document_type(doc),
-                'layout': self.layout_analyzer.analyze(doc),
-                'ocr_pages': self.ocr_detector.detect_ocr_pages(doc),
-                'metadata': self._extract_metadata(doc),
-                'language': self._detect_language(doc),
-                'formatting': self._analyze_formatting(doc),
-                'has_toc': self._detect_toc(doc),
-                'has_images': self._detect_images(doc),
-                'text_density': self._calculate_text_density(doc)
-            }
+            stat = os.stat(pdf_path)
+            profile = self._profile_file(pdf_path, stat.st_mtime_ns, stat.st_size)
             
-            doc.close()
-            return profile
+            # Callers get their own copy of the cached profile
+            return copy.deepcopy(profile)
             
         except Exception as e:
             logger.error(f"Failed to profile document: {str(e)}")
             return {'error': str(e)}
     
-    def _detect_document_type(self, doc: fitz.Document) -> str:
+    def _profile_file(self, pdf_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+        """Profile one version of a file, keyed by path, mtime and size"""
+        with fitz.open(pdf_path) as doc:
+            # Extract each page once and share it across all checks
+            pages = build_page_cache(doc)
+            
+            return {
+                'path': pdf_path,
+                'page_count': len(doc),
+                'type': self._detect_document_type(pages),
+                'layout': self.layout_analyzer.analyze(doc, pages),
+                'ocr_pages': self.ocr_detector.detect_ocr_pages(doc, pages),
+                'metadata': self._extract_metadata(doc),
+                'language': self._detect_language(pages),
+                'formatting': self._analyze_formatting(pages),
+                'has_toc': self._detect_toc(pages),
+                'has_images': self._detect_images(pages),
+                'text_density': self._calculate_text_density(pages)
+            }
+    
+    def _detect_document_type(self, pages: List[Dict[str, Any]]) -> str:
         """Detect the type of document"""
         # Sample text from first few pages
         sample_text = ""
-        pages_to_check = min(5, len(doc))
+        pages_to_check = min(5, len(pages))
         
         for i in range(pages_to_check):
-            sample_text += doc[i].get_text().lower()
+            sample_text += pages[i]['text'].lower()
         
         if not sample_text:
             return 'unknown'
         
         # Score each type
         type_scores = {}
+        found_keywords = self._find_keywords(sample_text)
         
         for doc_type, indicators in self.type_indicators.items():
             score = 0.0
             
             # Check keywords
             for keyword in indicators['keywords']:
-                if keyword in sample_text:
+                if keyword in found_keywords:
                     score += indicators['weight']
             
             # Check patterns
             for pattern in indicators['patterns']:
-                if re.search(pattern, sample_text, re.I):
+                if pattern.search(sample_text):
                     score += indicators['weight'] * 0.5
             
             type_scores[doc_type] = score
@@ -114,55 +176,57 @@ class DocumentProfiler:
         
         return 'general'
     
+    def _find_keywords(self, text: str) -> Set[str]:
+        """Find all type indicator keywords present in text"""
+        if self.keyword_automaton is not None:
+            return {keyword for _, keyword in self.keyword_automaton.iter(text)}
+        return {keyword for keyword in self.keywords if keyword in text}
+    
     def _extract_metadata(self, doc: fitz.Document) -> Dict[str, str]:
         """Extract document metadata"""
-        metadata = doc.metadata
-        
-        # Clean and standardize metadata
-        cleaned = {}
-        for key, value in metadata.items():
-            if value and isinstance(value, str) and value.strip():
-                cleaned[key.lower()] = value.strip()
+        metadata = doc.metadata or {}
         
-        return cleaned
+        # Clean and standardize metadata; PyMuPDF values are str or None
+        return {name: stripped for key, name in _METADATA_KEYS
+                if (value := metadata.get(key)) and (stripped := value.strip())}
     
-    def _detect_language(self, doc: fitz.Document) -> str:
+    def _detect_language(self, pages: List[Dict[str, Any]]) -> str:
         """Detect primary language of document"""
         # Simple language detection based on character sets
         sample_text = ""
-        pages_to_check = min(3, len(doc))
+        pages_to_check = min(3, len(pages))
         
         for i in range(pages_to_check):
-            sample_text += doc[i].get_text()
+            sample_text += pages[i]['text']
         
         if not sample_text:
             return 'unknown'
         
-        # Check for non-Latin scripts
-        if re.search(r'[\u4e00-\u9fff]', sample_text):  # Chinese
-            return 'chinese'
-        elif re.search(r'[\u3040-\u309f\u30a0-\u30ff]', sample_text):  # Japanese
-            return 'japanese'
-        elif re.search(r'[\u0600-\u06ff]', sample_text):  # Arabic
-            return 'arabic'
-        elif re.search(r'[\u0400-\u04ff]', sample_text):  # Cyrillic
-            return 'russian'
+        if sample_text.isascii():
+            return 'english'
+        
+        # Check for non-Latin scripts on the decoded codepoints in one buffer
+        codepoints = np.frombuffer(sample_text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+        codepoints = codepoints[codepoints >= _MIN_SCRIPT_CODEPOINT]
+        for language, ranges in _LANGUAGE_RANGES:
+            for low, high in ranges:
+                if np.any((codepoints >= low) & (codepoints <= high)):
+                    return language
         
         # Default to English
         return 'english'
     
 # src/outline_extraction/profilers/document_profiler.py (continued)
-    def _analyze_formatting(self, doc: fitz.Document) -> Dict[str, Any]:
+    def _analyze_formatting(self, pages: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze document formatting consistency"""
         font_sizes = []
         fonts = []
         line_heights = []
         
-        pages_to_check = min(5, len(doc))
+        pages_to_check = min(5, len(pages))
         
         for i in range(pages_to_check):
-            page = doc[i]
-            blocks = page.get_text("dict")["blocks"]
+            blocks = pages[i]['dict']["blocks"]
             
             for block in blocks:
                 if "lines" in block:
@@ -172,80 +236,59 @@ class DocumentProfiler:
                                 font_sizes.append(span["size"])
                                 fonts.append(span["font"])
         
+        # Count once and derive every summary from the counters
+        font_counts = Counter(fonts)
+        size_counts = Counter(font_sizes)
+        
         return {
-            'unique_fonts': len(set(fonts)),
-            'unique_font_sizes': len(set(font_sizes)),
-            'most_common_font': Counter(fonts).most_common(1)[0][0] if fonts else None,
-            'most_common_size': Counter(font_sizes).most_common(1)[0][0] if font_sizes else None,
-            'font_size_range': (min(font_sizes), max(font_sizes)) if font_sizes else (0, 0),
-            'formatting_consistency': self._calculate_consistency(fonts, font_sizes)
+            'unique_fonts': len(font_counts),
+            'unique_font_sizes': len(size_counts),
+            'most_common_font': max(font_counts.items(), key=itemgetter(1))[0] if fonts else None,
+            'most_common_size': max(size_counts.items(), key=itemgetter(1))[0] if font_sizes else None,
+            'font_size_range': (min(size_counts), max(size_counts)) if font_sizes else (0, 0),
+            'formatting_consistency': self._calculate_consistency(font_counts, size_counts, len(fonts))
         }
     
-    def _calculate_consistency(self, fonts: List[str], sizes: List[float]) -> float:
+    def _calculate_consistency(self, font_counts: Counter, size_counts: Counter,
+                               span_count: int) -> float:
         """Calculate formatting consistency score"""
-        if not fonts or not sizes:
+        if not span_count:
             return 0.0
         
         # Font consistency
-        font_counts = Counter(fonts)
-        most_common_font_ratio = font_counts.most_common(1)[0][1] / len(fonts)
+        most_common_font_ratio = max(font_counts.values()) / span_count
         
         # Size consistency
-        size_counts = Counter(sizes)
-        most_common_size_ratio = size_counts.most_common(1)[0][1] / len(sizes)
+        most_common_size_ratio = max(size_counts.values()) / span_count
         
         # Combined score
         return (most_common_font_ratio + most_common_size_ratio) / 2
     
-    def _detect_toc(self, doc: fitz.Document) -> bool:
+    def _detect_toc(self, pages: List[Dict[str, Any]]) -> bool:
         """Detect if document has table of contents"""
-        # Check first few pages
-        pages_to_check = min(5, len(doc))
-        
-        toc_indicators = [
-            r'table\s+of\s+contents',
-            r'contents\s*\n',
-            r'^\s*\d+\.\s+.+\s+\d+\s*$',  # Pattern like "1. Introduction ... 5"
-            r'chapter\s+\d+.*page\s+\d+',
-            r'\.{3,}\s*\d+\s*$'  # Dots followed by page number
-        ]
-        
-        for i in range(pages_to_check):
-            text = doc[i].get_text().lower()
-            
-            for pattern in toc_indicators:
-                if re.search(pattern, text, re.I | re.M):
-                    return True
-        
-        return False
+        # Check first few pages; patterns are case-insensitive, so no lower() copy
+        return any(pattern.search(page['text'])
+                   for page in pages[:5] for pattern in _TOC_PATTERNS)
     
-    def _detect_images(self, doc: fitz.Document) -> bool:
+    def _detect_images(self, pages: List[Dict[str, Any]]) -> bool:
         """Detect if document contains images"""
-        for page in doc:
-            image_list = page.get_images()
-            if image_list:
-                return True
-        return False
+        return any(page['images'] for page in pages)
     
-    def _calculate_text_density(self, doc: fitz.Document) -> float:
+    def _calculate_text_density(self, pages: List[Dict[str, Any]]) -> float:
         """Calculate average text density across pages"""
-        densities = []
+        if not pages:
+            return 0.0
         
-        for page in doc:
-            rect = page.rect
-            page_area = rect.width * rect.height
-            
-            # Get text blocks
-            blocks = page.get_text("blocks")
-            text_area = 0
-            
-            for block in blocks:
-                if len(block) >= 5:  # block has bbox
-                    bbox = block[:4]
-                    text_area += (bbox[2] - bbox[0]) * (bbox[3] - bbox[1])
-            
-            if page_area > 0:
-                density = text_area / page_area
-                densities.append(min(density, 1.0))  # Cap at 1.0
+        page_areas = np.array([page['rect'].width * page['rect'].height for page in pages])
+        
+        # Sum block areas per page over one bbox array for the whole document
+        bboxes = np.array([block[:4] for page in pages for block in page['blocks']],
+                          dtype=np.float64).reshape(-1, 4)
+        block_pages = np.repeat(np.arange(len(pages)), [len(page['blocks']) for page in pages])
+        block_areas = (bboxes[:, 2] - bboxes[:, 0]) * (bboxes[:, 3] - bboxes[:, 1])
+        text_areas = np.bincount(block_pages, weights=block_areas, minlength=len(pages))
+        
+        has_area = page_areas > 0
+        densities = np.minimum(text_areas[has_area] / page_areas[has_area], 1.0)  # Cap at 1.0
         
-        return sum(densities) / len(densities) if densities else 0.0
\ No newline at end of file
+        return float(densities.mean()) if densities.size else 0.0
@@ -1,8 +1,15 @@
 # src/outline_extraction/profilers/layout_analyzer.py
 import fitz
+import re
 import numpy as np
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from collections import Counter
+from operator import itemgetter
+
+from .page_cache import build_page_cache
+
+# Standalone page number in a footer, e.g. "12" or "Page 3 of 10"
+_PAGE_NUMBER = re.compile(r'\b\d{1,4}\b')
 
 class LayoutAnalyzer:
     """Analyze document layout structure"""
@@ -11,15 +18,21 @@ class LayoutAnalyzer:
         self.column_threshold = 50  # pixels
         self.margin_threshold = 0.1  # 10% of page width
     
-    def analyze(self, doc: fitz.Document) -> Dict[str, Any]:
+    def analyze(self, doc: fitz.Document,
+                pages: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """Analyze document layout"""
+        if pages is None:
+            pages = build_page_cache(doc)
+        
+        has_headers, has_footers, has_sidebars = self._analyze_block_positions(pages)
+        
         layout_info = {
-            'columns': self._detect_columns(doc),
-            'margins': self._analyze_margins(doc),
-            'orientation': self._detect_orientation(doc),
-            'has_headers': self._detect_headers(doc),
-            'has_footers': self._detect_footers(doc),
-            'has_sidebars': self._detect_sidebars(doc),
+            'columns': self._detect_columns(pages),
+            'margins': self._analyze_margins(pages),
+            'orientation': self._detect_orientation(pages),
+            'has_headers': has_headers,
+            'has_footers': has_footers,
+            'has_sidebars': has_sidebars,
             'layout_type': 'unknown'
         }
         
@@ -33,16 +46,15 @@ class LayoutAnalyzer:
         
         return layout_info
     
-    def _detect_columns(self, doc: fitz.Document) -> int:
+    def _detect_columns(self, pages: List[Dict[str, Any]]) -> int:
         """Detect number of columns in document"""
         column_counts = []
         
         # Check a sample of pages
-        pages_to_check = min(5, len(doc))
+        pages_to_check = min(5, len(pages))
         
         for i in range(pages_to_check):
-            page = doc[i]
-            blocks = page.get_text("blocks")
+            blocks = pages[i]['blocks']
             
             if len(blocks) < 3:  # Too few blocks
                 continue
@@ -60,7 +72,7 @@ class LayoutAnalyzer:
         
         # Return most common column count
         if column_counts:
-            return Counter(column_counts).most_common(1)[0][0]
+            return max(Counter(column_counts).items(), key=itemgetter(1))[0]
         return 1
     
     def _cluster_coordinates(self, coords: List[float]) -> List[List[float]]:
@@ -71,50 +83,35 @@ class LayoutAnalyzer:
         sorted_coords = sorted(coords)
         clusters = [[sorted_coords[0]]]
         
+        # Coordinates are sorted, so only the most recent cluster can be close enough
         for coord in sorted_coords[1:]:
-            # Check if close to existing cluster
-            added = False
-            for cluster in clusters:
-                if abs(coord - cluster[-1]) < self.column_threshold:
-                    cluster.append(coord)
-                    added = True
-                    break
-            
-            if not added:
+            if coord - clusters[-1][-1] < self.column_threshold:
+                clusters[-1].append(coord)
+            else:
                 clusters.append([coord])
         
         # Filter out small clusters
         return [c for c in clusters if len(c) > 2]
     
-    def _analyze_margins(self, doc: fitz.Document) -> Dict[str, float]:
+    def _analyze_margins(self, pages: List[Dict[str, Any]]) -> Dict[str, float]:
         """Analyze page margins"""
         margins = {'top': [], 'bottom': [], 'left': [], 'right': []}
         
-        for page in doc[:min(5, len(doc))]:
-            rect = page.rect
-            blocks = page.get_text("blocks")
+        for page in pages[:5]:
+            rect = page['rect']
+            blocks = page['blocks']
             
             if not blocks:
                 continue
             
-            # Find extremes
-            min_x = min_y = float('inf')
-            max_x = max_y = float('-inf')
-            
-            for block in blocks:
-                if len(block) >= 5:
-                    bbox = block[:4]
-                    min_x = min(min_x, bbox[0])
-                    min_y = min(min_y, bbox[1])
-                    max_x = max(max_x, bbox[2])
-                    max_y = max(max_y, bbox[3])
+            # Find extremes with one builtin reduction per bbox column
+            x0s, y0s, x1s, y1s = zip(*[block[:4] for block in blocks])
             
             # Calculate margins
-            if min_x != float('inf'):
-                margins['left'].append(min_x)
-                margins['right'].append(rect.width - max_x)
-                margins['top'].append(min_y)
-                margins['bottom'].append(rect.height - max_y)
+            margins['left'].append(min(x0s))
+            margins['right'].append(rect.width - max(x1s))
+            margins['top'].append(min(y0s))
+            margins['bottom'].append(rect.height - max(y1s))
         
         # Average margins
         result = {}
@@ -126,67 +123,69 @@ class LayoutAnalyzer:
         
         return result
     
-    def _detect_orientation(self, doc: fitz.Document) -> str:
+    def _detect_orientation(self, pages: List[Dict[str, Any]]) -> str:
         """Detect page orientation"""
-        orientations = []
-        
-        for page in doc:
-            rect = page.rect
-            if rect.width > rect.height:
-                orientations.append('landscape')
-            else:
-                orientations.append('portrait')
-        
-        # Return most common
-        return Counter(orientations).most_common(1)[0][0]
+        landscape = sum(page['rect'].width > page['rect'].height for page in pages)
+        portrait = len(pages) - landscape
+        
+        # Return most common; a tie goes to the first page's orientation
+        if landscape == portrait:
+            first_rect = pages[0]['rect']
+            return 'landscape' if first_rect.width > first_rect.height else 'portrait'
+        return 'landscape' if landscape > portrait else 'portrait'
     
-    def _detect_headers(self, doc: fitz.Document) -> bool:
-        """Detect if document has headers"""
+    def _analyze_block_positions(self, pages: List[Dict[str, Any]]) -> Tuple[bool, bool, bool]:
+        """Detect headers, footers and sidebars in one pass over the first pages"""
         header_texts = []
+        footer_texts = []
+        has_sidebars = False
         
         # Check first few pages
-        for i in range(min(5, len(doc))):
-            page = doc[i]
-            blocks = page.get_text("blocks")
+        for page in pages[:5]:
+            page_height = page['rect'].height
+            page_width = page['rect'].width
             
-            # Look at top 10% of page
-            page_height = page.rect.height
+            # Look at top and bottom 10% of page
             header_threshold = page_height * 0.1
+            footer_threshold = page_height * 0.9
             
-            for block in blocks:
-                if len(block) >= 5:
-                    if block[1] < header_threshold:  # y-coordinate
-                        header_texts.append(block[4])
+            # Count narrow blocks in left and right margins
+            left_margin_blocks = 0
+            right_margin_blocks = 0
+            margin_width = page_width * 0.25  # 25% of page width
+            
+            for block in page['blocks']:
+                if block[1] < header_threshold:  # y-coordinate
+                    header_texts.append(block[4])
+                elif block[1] > footer_threshold:
+                    footer_texts.append(block[4])
+                
+                # Check if narrow block in margin area
+                if block[2] - block[0] < margin_width:
+                    if block[0] < margin_width:
+                        left_margin_blocks += 1
+                    elif block[2] > page_width - margin_width:
+                        right_margin_blocks += 1
+            
+            # If consistent narrow blocks in margins
+            if left_margin_blocks > 3 or right_margin_blocks > 3:
+                has_sidebars = True
         
-        # Check for repeated headers
+        return (self._has_repeated_headers(header_texts),
+                self._has_footers(footer_texts),
+                has_sidebars)
+    
+    def _has_repeated_headers(self, header_texts: List[str]) -> bool:
+        """Check whether header texts repeat"""
         if len(header_texts) > 2:
-            # Check if headers repeat
             header_counter = Counter(header_texts)
-            most_common = header_counter.most_common(1)[0]
-            return most_common[1] > 1  # Appears more than once
+            return max(header_counter.values()) > 1  # Appears more than once
         
         return False
     
-    def _detect_footers(self, doc: fitz.Document) -> bool:
-        """Detect if document has footers"""
-        footer_texts = []
-        
-        # Check first few pages
-        for i in range(min(5, len(doc))):
-            page = doc[i]
-            blocks = page.get_text("blocks")
-            
-            # Look at bottom 10% of page
-            page_height = page.rect.height
-            footer_threshold = page_height * 0.9
-            
-            for block in blocks:
-                if len(block) >= 5:
-                    if block[1] > footer_threshold:  # y-coordinate
-                        footer_texts.append(block[4])
-        
-        # Check for page numbers or repeated footers
-        has_page_numbers = any(str(i) in text for i, text in enumerate(footer_texts, 1))
+    def _has_footers(self, footer_texts: List[str]) -> bool:
+        """Check footer texts for page numbers or repeated footers"""
+        has_page_numbers = any(_PAGE_NUMBER.search(text) for text in footer_texts)
         
         if has_page_numbers:
             return True
@@ -194,37 +193,6 @@ class LayoutAnalyzer:
         # Check for repeated footers
         if len(footer_texts) > 2:
             footer_counter = Counter(footer_texts)
-            most_common = footer_counter.most_common(1)[0]
-            return most_common[1] > 1
+            return max(footer_counter.values()) > 1
         
         return False
-    
-    def _detect_sidebars(self, doc: fitz.Document) -> bool:
-        """Detect if document has sidebars"""
-        for page in doc[:min(5, len(doc))]:
-            blocks = page.get_text("blocks")
-            page_width = page.rect.width
-            
-            # Count blocks in left and right margins
-            left_margin_blocks = 0
-            right_margin_blocks = 0
-            
-            margin_width = page_width * 0.25  # 25% of page width
-            
-            for block in blocks:
-                if len(block) >= 5:
-                    bbox = block[:4]
-                    block_width = bbox[2] - bbox[0]
-                    
-                    # Check if narrow block in margin area
-                    if block_width < margin_width:
-                        if bbox[0] < margin_width:
-                            left_margin_blocks += 1
-                        elif bbox[2] > page_width - margin_width:
-                            right_margin_blocks += 1
-            
-            # If consistent narrow blocks in margins
-            if left_margin_blocks > 3 or right_margin_blocks > 3:
-                return True
-        
-        return False
\ No newline at end of file
@@ -1,7 +1,9 @@
 # src/outline_extraction/profilers/ocr_detector.py
 import fitz
 import logging
-from typing import List, Set
+from typing import Any, Dict, List, Optional, Set
+
+from .page_cache import build_page_cache
 
 logger = logging.getLogger(__name__)
 
@@ -13,21 +15,23 @@ class OCRDetector:
         self.readable_ratio_threshold = 0.7  # 70% readable characters
         self.font_info_threshold = 0.5  # 50% of text should have font info
     
-    def detect_ocr_pages(self, doc: fitz.Document) -> List[int]:
+    def detect_ocr_pages(self, doc: fitz.Document,
+                         pages: Optional[List[Dict[str, Any]]] = None) -> List[int]:
         """Detect pages that need OCR"""
+        if pages is None:
+            pages = build_page_cache(doc)
+        
         ocr_pages = []
         
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            
+        for page_num, page in enumerate(pages):
             # Special handling for first page - if it's just a title page with minimal text,
             # but other pages have good content, don't trigger OCR
-            if page_num == 0 and len(doc) > 1:
-                text = page.get_text().strip()
+            if page_num == 0 and len(pages) > 1:
+                text = page['text'].strip()
                 if len(text) < self.min_text_length:
                     # Check if subsequent pages have good content
-                    next_page = doc[1]
-                    next_text = next_page.get_text().strip()
+                    next_page = pages[1]
+                    next_text = next_page['text'].strip()
                     next_font_info = self._check_font_info(next_page)
                     
                     # If next page has good content and font info, skip OCR for first page
@@ -40,27 +44,28 @@ class OCRDetector:
         logger.info(f"Detected {len(ocr_pages)} pages needing OCR")
         return ocr_pages
     
-    def _needs_ocr(self, page: fitz.Page) -> bool:
+    def _needs_ocr(self, page: Dict[str, Any]) -> bool:
         """Check if a page needs OCR"""
         # Check 1: Text length
-        text = page.get_text().strip()
+        text = page['text'].strip()
         if len(text) < self.min_text_length:
             return True
         
-        # Check 2: Readable character ratio
+        # Checks run cheapest first; any failing check means OCR
+        # Check 2: Image-only page (cached image list)
+        if self._is_image_only_page(page):
+            return True
+        
+        # Check 3: Readable character ratio
         readable_ratio = self._calculate_readable_ratio(text)
         if readable_ratio < self.readable_ratio_threshold:
             return True
         
-        # Check 3: Font information availability
+        # Check 4: Font information availability (walks every span)
         font_info_ratio = self._check_font_info(page)
         if font_info_ratio < self.font_info_threshold:
             return True
         
-        # Check 4: Image-only page
-        if self._is_image_only_page(page):
-            return True
-        
         return False
     
     def _calculate_readable_ratio(self, text: str) -> float:
@@ -68,12 +73,19 @@ class OCRDetector:
         if not text:
             return 0.0
         
-        readable = sum(1 for c in text if c.isprintable() or c.isspace())
-        return readable / len(text)
+        # Whitespace always counts as readable; str.split() drops exactly the
+        # str.isspace() characters, leaving one string to check in C
+        non_space = ''.join(text.split())
+        if non_space.isprintable():
+            return 1.0
+        
+        # Count each distinct unreadable character with str.count
+        unreadable = sum(non_space.count(c) for c in set(non_space) if not c.isprintable())
+        return (len(text) - unreadable) / len(text)
     
-    def _check_font_info(self, page: fitz.Page) -> float:
+    def _check_font_info(self, page: Dict[str, Any]) -> float:
         """Check how much text has font information"""
-        blocks = page.get_text("dict")["blocks"]
+        blocks = page['dict']["blocks"]
         
         total_chars = 0
         chars_with_font = 0
@@ -93,13 +105,13 @@ class OCRDetector:
         
         return chars_with_font / total_chars
     
-    def _is_image_only_page(self, page: fitz.Page) -> bool:
+    def _is_image_only_page(self, page: Dict[str, Any]) -> bool:
         """Check if page contains only images"""
         # Get text content
-        text = page.get_text().strip()
+        text = page['text'].strip()
         
         # Get images
-        images = page.get_images()
+        images = page['images']
         
         # If has images but no text
         if images and len(text) < 10:
@@ -107,19 +119,13 @@ class OCRDetector:
         
         # Check if page is mostly covered by images
         if images:
-            page_area = page.rect.width * page.rect.height
+            page_area = page['rect'].width * page['rect'].height
             image_area = 0
             
+            # Estimate image area from the listed pixel size (this is approximate);
+            # get_images() already carries width/height, so no stream is decoded
             for img in images:
-                try:
-                    # Get image bbox
-                    xref = img[0]
-                    img_dict = page.parent.extract_image(xref)
-                    if img_dict:
-                        # Estimate image area (this is approximate)
-                        image_area += img_dict.get("width", 0) * img_dict.get("height", 0)
-                except:
-                    pass
+                image_area += img[2] * img[3]
             
             # If images cover most of the page
             if page_area > 0 and image_area / page_area > 0.8:
@@ -0,0 +1,57 @@
+# src/outline_extraction/profilers/page_cache.py
+import os
+import fitz
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+from config.settings import MAX_WORKERS
+
+# Profilers only read text blocks, so skip image blocks and their pixel data
+_DICT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# Shorter documents are extracted in-process; worker startup would dominate
+PARALLEL_MIN_PAGES = 32
+
+def build_page_cache(doc: fitz.Document) -> List[Dict[str, Any]]:
+    """Extract every page once for all profiling routines"""
+    page_count = len(doc)
+    workers = min(MAX_WORKERS, os.cpu_count() or 1)
+    if page_count < PARALLEL_MIN_PAGES or workers < 2 or not doc.name or doc.is_encrypted:
+        return [_cache_page(page) for page in doc]
+
+    # MuPDF is not thread-safe, so each worker process opens its own copy
+    # of the file and extracts one contiguous page range
+    chunk_size = -(-page_count // workers)
+    ranges = [(doc.name, start, min(start + chunk_size, page_count))
+              for start in range(0, page_count, chunk_size)]
+
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        return [page for chunk in executor.map(_cache_page_range, ranges) for page in chunk]
+
+def _cache_page_range(page_range) -> List[Dict[str, Any]]:
+    """Extract a page range from a separately opened document"""
+    path, start, stop = page_range
+    with fitz.open(path) as doc:
+        return [_cache_page(doc[page_num]) for page_num in range(start, stop)]
+
+def _cache_page(page: fitz.Page) -> Dict[str, Any]:
+    """Derive plain text and text blocks from a single "dict" extraction"""
+    page_dict = page.get_text("dict", flags=_DICT_FLAGS)
+
+    # Same tuples as page.get_text("blocks")
+    blocks = []
+    for block in page_dict["blocks"]:
+        if "lines" in block:
+            block_text = "".join(
+                "".join(span["text"] for span in line["spans"]) + "\n"
+                for line in block["lines"]
+            )
+            blocks.append((*block["bbox"], block_text, block["number"], 0))
+
+    return {
+        'rect': page.rect,
+        'dict': page_dict,
+        'blocks': blocks,
+        'text': "".join(block[4] for block in blocks),  # Same as page.get_text()
+        'images': page.get_images()
+    }
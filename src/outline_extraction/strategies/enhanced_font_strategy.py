@@ -16,7 +16,10 @@ Key Improvements:
 import re
 import numpy as np
 from typing import List, Dict, Any, Tuple, Optional
-from collections import Counter, defaultdict
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
 import logging
 
 try:
@@ -31,109 +34,572 @@ except ImportError:
         def detect(self, blocks: List[Dict], profile: Dict) -> List[Dict]:
             pass
 
+# pyahocorasick is optional: without it keyword lists are matched with substring checks
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# google-re2 is optional: without it every pattern family is matched with re
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Characters matched by re's \s on ASCII text; RE2's \s omits \v and \x1c-\x1f
+_RE2_SPACE_RANGES = r'\t-\r\x1c-\x20'
+# re's $ also matches before a final newline; RE2's only at the very end
+_RE2_END = r'\n?$'
+# Escapes that RE2 and re already read the same way on ASCII text; any other
+# letter or digit escape (\S, \Z, backreferences...) is refused
+_RE2_SAME_ESCAPES = frozenset((r'\w', r'\W', r'\d', r'\D', r'\b', r'\B'))
+
+def _compile_any(patterns: Tuple[str, ...], flags: int = 0) -> re.Pattern:
+    """Compile patterns into one alternation that matches wherever any of them does"""
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), flags)
+
+def _to_re2_syntax(pattern: str) -> str:
+    """Spell out \\s and $ so RE2 agrees with re on ASCII text"""
+    converted = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            escape = pattern[i:i + 2]
+            if escape == r'\s':
+                escape = _RE2_SPACE_RANGES if in_class else f'[{_RE2_SPACE_RANGES}]'
+            elif escape[1:].isalnum() and (escape not in _RE2_SAME_ESCAPES or
+                                           in_class and escape in (r'\b', r'\B')):
+                raise ValueError(f"Escape {escape!r} in {pattern!r} has no RE2 translation")
+            converted.append(escape)
+            i += 2
+            continue
+        if char == '[' and not in_class:
+            in_class = True
+            if pattern.startswith((']', '^]'), i + 1):
+                raise ValueError(f"Leading ']' in a class of {pattern!r} has no RE2 translation")
+        elif char == ']':
+            in_class = False
+        elif char == '$' and not in_class:
+            char = _RE2_END
+        converted.append(char)
+        i += 1
+    return ''.join(converted)
+
+def _compile_re2_set(patterns: Tuple[str, ...], case_sensitive: bool = True):
+    """Compile patterns into an RE2 set anchored at the start of the text"""
+    if not RE2_AVAILABLE:
+        return None
+    options = re2.Options()
+    options.case_sensitive = case_sensitive
+    pattern_set = re2.Set.MatchSet(options)
+    for pattern in patterns:
+        pattern_set.Add(_to_re2_syntax(pattern))
+    pattern_set.Compile()
+    return pattern_set
+
+def _size_key(font_size: float) -> int:
+    """Quantize a font size to tenths of a point for hierarchy lookups"""
+    return round(font_size * 10)
+
+def _build_keyword_automaton(keywords: Tuple[str, ...]):
+    """Build an Aho-Corasick automaton over keywords"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+def _contains_any(automaton, keywords: Tuple[str, ...], text: str) -> bool:
+    """Check whether text contains any keyword, in one pass when possible"""
+    if automaton is not None:
+        return next(automaton.iter(text), None) is not None
+    return any(keyword in text for keyword in keywords)
+
+def _matches_any(pattern_set, alternation: re.Pattern, text: str) -> bool:
+    """Match text against a pattern family, in one RE2 DFA pass when possible"""
+    # RE2's \w, \d and \b are ASCII-only, so other text goes through re
+    if pattern_set is not None and text.isascii():
+        return bool(pattern_set.Match(text))
+    return alternation.match(text) is not None
+
+# Universal noise patterns to filter out (not domain-specific)
+_NOISE_PATTERNS = (
+    # UI elements and artifacts
+    r'^[©®™]\s*\w*$',                    # Copyright symbols
+    r'^\s*[x×]\s*$',                     # Close buttons
+    r'^[<>]\s*\w*$',                     # Navigation elements
+    r'^\s*\d{1,2}\s*$',                  # Standalone numbers
+    r'^[^\w\s]*$',                       # Only punctuation/symbols
+    r'^\s*[A-Z]{1,2}\d+\s*$',           # Element IDs like "A2", "H1"
+    
+    # OCR artifacts and errors  
+    r'^[A-Z]{1,2}\s+[A-Z]{1,2}[^a-z]*$', # "A B", "O01", etc.
+    r'.*[,]{2,}.*',                      # Multiple commas (OCR error)
+    r'.*[.]{3,}.*',                      # Multiple dots (OCR error)
+    r'^[^\w\s]*[A-Z]{1,3}[^\w\s]*$',    # Single letters with symbols
+    r'^.{1,3}$',                         # Very short fragments (1-3 chars)
+    r'^[A-Z]\s[a-z]\s*$',                # "A Export a POF" -> "A Export"
+    
+    # Common OCR mistakes
+    r'.*\bPOF\b.*',                      # "POF" instead of "PDF"
+    r'.*\bOﬃce\b.*',                    # "Oﬃce" instead of "Office"
+    r'^[A-Z]{1,2}[^a-zA-Z\s]+.*',       # Single letter followed by symbols
+    r'^CG\s+\w+.*',                     # "CG Connected" OCR errors
+    r'^[A-Z]{2}\s+[A-Z].*',             # "CG Connected", "AB Something" patterns
+    
+    # Navigation and UI text
+    r'^(Help|Cancel|Close|OK|Next|Back|Continue|Submit)$',
+    r'^(All\s+tools?|Tools?|Menu|Settings?).*',
+    r'^(Export|Import|Create|Delete|Edit)\s+[a-z].*',  # Menu items
+    r'^(Share|Send|Upload|Download)\s*$',
+    r'^(Home|Search|Profile|Account)\s*$',
+    
+    # Common UI fragments and button text
+    r'.*\s[+=×÷]\s.*',                   # Math operators in UI
+    r'^(Good\s+morning|Hello|Welcome).*', # Greeting text
+    r'^\([^)]*\)\s*$',                   # Text in parentheses only
+    r'^[\d\s\-\|]+$',                    # Only numbers, spaces, dashes, pipes
+    r'^[A-Z]{1,2}\s+[A-Z]{1,2}\s*$',    # "A B", "H1 H2" patterns
+    
+    # Generic noise patterns
+    r'^(Note:?|Note|Tip:?|Warning:?).*',  # Enhanced note indicators (any text after)
+    r'^notes?(\s+\w+)*$',                # "Note", "Notes", "Note something"
+    r'^(Step\s+\d+:?)$',                # Step indicators without content
+    r'^(Figure\s+\d+|Table\s+\d+).*',   # Figure/table references
+)
+_NOISE = _compile_any(_NOISE_PATTERNS, re.IGNORECASE)
+_NOISE_SET = _compile_re2_set(_NOISE_PATTERNS, case_sensitive=False)
+
+# Patterns for quality headings (universal)
+_QUALITY_HEADING_PATTERNS = (
+    # Clear section headers
+    r'^[A-Z][a-z]+(\s+[A-Z][a-z]*)*\s*$',           # Title Case
+    r'^[A-Z][A-Z\s]+[A-Z]$',                        # ALL CAPS HEADINGS
+    r'^\d+\.?\s+[A-Z][a-z].*$',                     # Numbered sections
+    r'^[A-Z][a-z]+.*:$',                            # Headers ending with colon
+    r'^(Chapter|Section|Part|Unit)\s+\d+.*$',       # Structural headings
+    r'^(Overview|Introduction|Conclusion|Summary)$', # Standard section names
+    
+    # Universal document patterns for different content types
+    r'^[A-Z][a-z]+(\s+[A-Z][a-z]+)*$',             # Title Case: "Project Management", "Data Analysis" 
+    r'^[A-Z][a-z]+(\s+[a-z]+)*(\s+[A-Z][a-z]+)*$', # Mixed case: "Sales and Marketing"
+    r'^[A-Z][a-z]+\s+(with|and|in|on|for)\s+[A-Z][a-z]+.*$', # "Analysis with Python"
+    r'^(Chapter|Section|Part|Introduction|Overview|Summary|Conclusion|Method|Process|Results).*$', # Common section headers
+    r'^(Step|Phase|Stage)\s*\d*\s*:.*$',           # Sequential information
+    r'^[A-Z][a-z]+(\s+[A-Z][a-z]+)*\s*$',         # Clean multi-word titles
+)
+_QUALITY_HEADING = _compile_any(_QUALITY_HEADING_PATTERNS)
+_QUALITY_HEADING_SET = _compile_re2_set(_QUALITY_HEADING_PATTERNS)
+
+# Recipe-style name patterns ("Chicken and Rice", "Sweet and Sour Chicken")
+_RECIPE_NAME = _compile_any((
+    r'^[A-Z][a-z]+(\s+(and|with|in|&)\s+[A-Z][a-z]+)+$',  # "Chicken and Rice"
+    r'^[A-Z][a-z]+\s+[A-Z][a-z]+(\s+[A-Z][a-z]+)*$',      # "Chicken Alfredo", "Beef Stir Fry"
+    r'^[A-Z][a-z]+(\s+[a-z]+)*\s+[A-Z][a-z]+$',           # "Sweet and Sour Chicken"
+))
+
+_OCR_ERROR = _compile_any((
+    r'\bPOF\b',      # "POF" instead of "PDF"
+    r'\bOﬃce\b',    # "Oﬃce" instead of "Office"
+    r'\b[A-Z]\s[a-z]\b',  # Single letter followed by word
+    r'[A-Z]{3,}[a-z]{1,2}[A-Z]',  # Mixed case errors
+))
+
+# Multi-word title patterns matched against the heading part of a block
+_STRUCTURE = _compile_any((
+    r'^[A-Z][a-z]+(\s+(and|with|in|of|for)\s+[A-Z][a-z]+)+',  # "Analysis and Results"
+    r'^[A-Z][a-z]+\s+[A-Z][a-z]+(\s+[A-Z][a-z]+)*',          # "Project Management", "Data Analysis"
+    r'^[A-Z][a-z]+(\s+[a-z]+)*\s+[A-Z][a-z]+',               # "Best and Worst Case"
+))
+
+# Sequential markers ("Step 1", "Appendix A", "2.1") in lowercased heading text
+_SEQUENCE = _compile_any((
+    r'(step|phase|part|section|chapter)\s*\d+',
+    r'(stage|level|tier)\s*\d+',
+    r'(appendix|annex)\s*[a-z]',
+    r'\d+\.\d+',  # "2.1", "3.4" etc.
+))
+
+_LONG_NUMBERED_ITEM = re.compile(r'^\d+\.\s+.{30,}')  # Long numbered instructions
+_LONG_NUMBER = re.compile(r'\d{3,}')  # Long numbers (likely IDs)
+_MENU_ITEM = re.compile(r'^[A-Z][a-z]*\s+(a|an|the)\s+[A-Z]')  # "Export a PDF"
+_MEASUREMENT = re.compile(r'^\d+\s*(percent|%|mm|cm|kg|lb|inch)')
+
+# Heading extraction from blocks that mix a title with other content
+_TRAILING_HEADING = re.compile(r'.*[.!?]\s+([A-Z][^\d\n][^\n.!?]*?)$', re.UNICODE)
+_CONTINUATION_WORDS = re.compile(r'\b(and|or|with|until|for|minutes?|hours?|step|process)\b')
+_MULTI_CONTENT_HEADING = re.compile(r'^([^\d\n][^\n]+?)\s+(Details?|Content|Information|Data)\s*:', re.UNICODE)
+_SINGLE_CONTENT_HEADING = re.compile(r'^([^\d\n][^\n]+?)\s*(Details?|Information|Content|Summary|Overview|Introduction|Conclusion)\s*:?', re.UNICODE)
+_DETAIL_SUFFIX = re.compile(r'\s+(?:Details?|Information|Content|Summary)')
+_WHITESPACE_RUN = re.compile(r'\s+')
+_TRAILING_ARTIFACT = re.compile(r'[^\w\s\'-éáíóúñç&()\/]$')
+# _CONTENT_SPLIT can only match text containing one of these
+_SPLIT_PUNCTUATION = re.compile(r'[.!?]')
+_CONTENT_SPLIT = re.compile(r'([.!?])\s+([A-Z][A-Za-z\s&\'-]{1,50})(?=\s+[A-Z]|\s*$|[.!?])')
+_NUMBERED_CONTINUATION = re.compile(r'\b(step|process|continue|follow|next)\s+\d')
+
+# Section keywords looked up as substrings of lowercased text
+_SECTION_INDICATORS = (
+    'overview', 'introduction', 'conclusion', 'summary',
+    'chapter', 'section', 'part', 'step', 'method', 'process'
+)
+_SECTION_INDICATOR_AUTOMATON = _build_keyword_automaton(_SECTION_INDICATORS)
+
+_SECTION_HEADERS = (
+    'introduction', 'overview', 'summary', 'conclusion', 'results', 'method',
+    'process', 'procedure', 'analysis', 'discussion', 'background', 'objectives',
+    'requirements', 'specifications', 'details', 'information', 'data', 'content'
+)
+_SECTION_HEADER_AUTOMATON = _build_keyword_automaton(_SECTION_HEADERS)
+
+# Standalone labels that are never headings on their own
+_LABEL_TEXTS = frozenset(('note:', 'note', 'tip:', 'tip', 'warning:', 'warning'))
+
+# Connecting words of multi-word titles, space-delimited for substring checks
+_CONNECTING_WORDS = tuple(f' {word} ' for word in ('with', 'and', 'in', 'on', 'for', 'of', 'by', 'to'))
+
+# Words marking subsection labels such as "Details:" or "For more information:"
+_SUBSECTION_WORDS = ('detail', 'information', 'note', 'example', 'reference')
+
+# OCR artifacts looked up as substrings of lowercased text
+_OCR_ERROR_TEXTS = ('pof', 'cg connected', 'all tools x')
+
+# Content words that suggest this is body text, not a heading
+_BODY_TEXT_INDICATORS = frozenset((
+    'the', 'and', 'or', 'but', 'with', 'from', 'into', 'onto', 'until',
+    'when', 'where', 'while', 'during', 'before', 'after', 'through',
+    'is', 'are', 'was', 'were', 'will', 'would', 'could', 'should',
+    'this', 'that', 'these', 'those', 'you', 'your', 'they', 'their'
+))
+
+# Minimum heading score for a block to be predicted as a heading
+_SCORE_THRESHOLD = 0.3
+
+# Numeric depth of each heading level; unknown levels count as H4
+_LEVEL_ORDER = {'H1': 1, 'H2': 2, 'H3': 3, 'H4': 4}
+
+# Prefixes and first words that mark instructions rather than headings
+_INSTRUCTION_STARTERS = ('click', 'select', 'choose', 'type', 'enter', 'press')
+_ACTION_VERBS = frozenset(_INSTRUCTION_STARTERS + ('drag', 'drop'))
+_INSTRUCTION_INDICATORS = frozenset((
+    'click', 'select', 'choose', 'enter', 'type', 'press', 'navigate',
+    'open', 'close', 'save', 'delete', 'edit', 'modify'
+))
+
+def _content_quality_score(text: str, text_lower: str, word_count: int) -> float:
+    """Analyze if text looks like a quality heading vs noise/body text"""
+    score = 0.0
+    
+    # Early rejection for obvious noise
+    if len(text.strip()) < 2:
+        return 0.0
+        
+    # Check for quality heading patterns
+    if _matches_any(_QUALITY_HEADING_SET, _QUALITY_HEADING, text):
+        score += 0.8
+    
+    # Length analysis - more lenient for recipe names
+    if 1 <= word_count <= 8:
+        score += 0.6  # Good heading length
+    elif 9 <= word_count <= 15:
+        score += 0.3  # Acceptable heading length
+    elif word_count == 0:
+        return 0.0   # No content
+    else:
+        score -= 0.1  # Reduced penalty for longer text (could be recipe names)
+    
+    # Character analysis
+    is_upper = text.isupper()
+    if text.istitle():  # Title Case
+        score += 0.4
+    elif is_upper and word_count <= 6:  # Short ALL CAPS
+        score += 0.3
+    
+    # Boost for clear section indicators  
+    if _contains_any(_SECTION_INDICATOR_AUTOMATON, _SECTION_INDICATORS, text_lower):
+        score += 0.3
+        
+    # RECIPE-SPECIFIC BOOSTS
+    # Recipe names often follow patterns like "Chicken and Rice", "Beef Stir-Fry"
+    if _RECIPE_NAME.match(text):
+        score += 0.4  # Strong boost for recipe name patterns
+    
+    # NEGATIVE SCORING for obvious problems
+    
+    # Avoid fragments and errors
+    if any(char in text for char in ['©', '®', '™', '×', '÷']):
+        score -= 0.5
+    
+    # OCR error patterns
+    if _OCR_ERROR.search(text):
+        score -= 0.4
+    
+    # Penalize very short text that's not clearly a heading
+    if len(text) <= 3 and not is_upper:
+        score -= 0.4  # Reduced penalty
+    
+    # Penalize text with numbers that look like UI elements
+    if _LONG_NUMBER.search(text):  # Long numbers (likely IDs)
+        score -= 0.2  # Reduced penalty
+    
+    # Penalize instruction-like text (but be more lenient for recipe names)
+    if text_lower.startswith(_INSTRUCTION_STARTERS):
+        score -= 0.2  # Reduced penalty since recipes might start with cooking verbs
+    
+    # Penalize text that looks like menu items or UI labels
+    if _MENU_ITEM.match(text):  # "Export a PDF"
+        score -= 0.2  # Reduced penalty
+    
+    return max(0.0, min(1.0, score))
+
+# The checks on the next block depend on the block's position and stay in
+# EnhancedFontStrategy._analyze_content_patterns
+def _content_pattern_terms(text: str, text_lower: str) -> Tuple[float, Tuple[float, ...]]:
+    """Text-only content pattern terms: the score before the next-block checks
+    and the adjustments made after them, in order"""
+    score = 0.0
+    
+    # Handle blocks that contain both heading and content (common in many PDF types)
+    # Extract just the heading part (before colon or bullet points)
+    heading_part = text
+    if ':' in text:
+        heading_part = text.partition(':')[0].strip()
+    elif '•' in text:
+        heading_part = text.partition('•')[0].strip()
+    elif '\n' in text:
+        # Take first line if multi-line
+        heading_part = text.partition('\n')[0].strip()
+    
+    # Use the heading part for analysis (the whole text is already lowercased)
+    heading_lower = (text_lower if heading_part is text else heading_part.lower()).strip()
+    
+    # 1. COMMON SECTION HEADERS (universal document patterns)
+    if _contains_any(_SECTION_HEADER_AUTOMATON, _SECTION_HEADERS, heading_lower):
+        score += 0.8
+    
+    # 2. STRUCTURED TITLE PATTERNS (focus on heading part only)
+    heading_words = heading_part.split()
+    heading_word_count = len(heading_words)
+    
+    # Short, title-case phrases (1-6 words) are often section names
+    if 1 <= heading_word_count <= 6 and heading_part.istitle():
+        score += 0.6
+        
+    # Titles with common connecting words
+    if heading_word_count <= 8 and any(word in heading_lower for word in _CONNECTING_WORDS):
+        score += 0.5
+        
+    # 3. DOCUMENT STRUCTURE PATTERNS (universal patterns)
+    if _STRUCTURE.match(heading_part):
+        score += 0.6  # Strong boost for structured patterns
+            
+    later_terms = []
+    
+    # 5. SUBSECTION HEADERS
+    # "Details:", "For more information:", etc.
+    if heading_lower.endswith(':') and heading_word_count <= 4:
+        if any(subsection_word in heading_lower for subsection_word in _SUBSECTION_WORDS):
+            later_terms.append(0.7)
+    
+    # 6. SEQUENTIAL INFORMATION
+    # "Step 1", "Phase 2", "Part A", etc.
+    if _SEQUENCE.search(heading_lower):
+        later_terms.append(0.6)
+    
+    # 7. BOOST FOR SECTION NAMES FOLLOWED BY DETAILS
+    if heading_lower.endswith(('details:', 'information:', 'content:', 'overview:')):
+        # Extract the section name part (before "details:")
+        section_name = heading_part.replace(' Details:', '').replace(' Information:', '').replace(' Content:', '').replace(' Overview:', '').strip()
+        section_name_words = len(section_name.split())
+        
+        if 2 <= section_name_words <= 6:  # Good section name length
+            later_terms.append(0.8)  # Very strong boost for section names with details
+        elif section_name_words > 0:  # Any section name
+            later_terms.append(0.6)  # Strong boost
+    
+    # 8. AVOID FALSE POSITIVES
+    # Don't boost obvious instruction text 
+    # Only penalize if text starts with action verb and is very long
+    first_word = heading_words[0].lower() if heading_words else ""
+    if first_word in _INSTRUCTION_INDICATORS and len(text) > 100:  # Increased threshold
+        later_terms.append(-0.2)  # Reduced penalty
+    
+    # Don't boost measurements or data themselves (just their headers)
+    if _MEASUREMENT.match(heading_lower):
+        later_terms.append(-0.3)
+        
+    return score, tuple(later_terms)
+
+def _length_penalty(text: str, text_lower: Optional[str] = None) -> float:
+    """Score penalty for text too long to be a heading"""
+    if len(text) <= 80:  # Short enough for any heading
+        return 0.0
+    
+    # Be lenient with recipe ingredient lists which naturally combine heading + content
+    if text_lower is None:
+        text_lower = text.lower()
+    is_recipe_heading = ('ingredients:' in text_lower or 
+                       text_lower.endswith('ingredients') or
+                       any(word in text_lower for word in ['recipe', 'preparation', 'cooking']))
+    
+    if is_recipe_heading:  # If this looks like a recipe heading, be lenient on length
+        if len(text) > 400:  # Only penalize extremely long text
+            return 0.2
+    else:
+        # Apply normal length penalties for non-recipe text
+        if len(text) > 200:
+            return 0.5
+        elif len(text) > 100:
+            return 0.3
+        elif len(text) > 80:
+            return 0.1
+    return 0.0
+
+@dataclass(frozen=True)
+class _TextTerms:
+    """Text-only parts of a block's heading score"""
+    __slots__ = ('is_noise', 'content_quality', 'content_patterns', 'penalties')
+
+    is_noise: bool
+    content_quality: float
+    content_patterns: Tuple[float, Tuple[float, ...]]
+    penalties: Tuple[float, ...]
+
+_NOISE_TERMS = _TextTerms(True, 0.0, (0.0, ()), ())
+
+# Memoized by text: running headers, footers and labels repeat across pages
+@lru_cache(maxsize=4096)
+def _text_terms(text: str) -> _TextTerms:
+    """Compute every text-only part of the heading score in one pass"""
+    # Reject obvious non-headings before any scoring work, cheapest
+    # checks first: a set lookup and substring tests before the regexes
+    text_lower = text.lower()
+    
+    # Early filter for common noise patterns that slip through
+    if text_lower.strip() in _LABEL_TEXTS:
+        return _NOISE_TERMS
+    
+    # Early filter for OCR errors
+    if any(error in text_lower for error in _OCR_ERROR_TEXTS):
+        return _NOISE_TERMS
+    
+    if _matches_any(_NOISE_SET, _NOISE, text):
+        return _NOISE_TERMS  # Completely eliminate noise
+    
+    # Split once for every check below
+    words = text_lower.split()
+    
+    # NEGATIVE SCORING - Remove obvious non-headings, in the order the
+    # score subtracts them
+    
+    # Penalize very long text (likely paragraphs or instructions)
+    penalties = [_length_penalty(text, text_lower)]
+    
+    # Penalize text with too many body text indicators
+    if len(words) > 0:
+        body_word_count = sum(map(_BODY_TEXT_INDICATORS.__contains__, words))
+        if body_word_count / len(words) > 0.3:
+            penalties.append(0.3)
+    
+    # Penalize sentences (end with punctuation, likely content); only
+    # single-line text counts, as '.' in the old '.*[.!?]\s*$' stopped at '\n'
+    stripped = text.rstrip()
+    if len(words) > 5 and stripped.endswith(('.', '!', '?')) and '\n' not in stripped:
+        penalties.append(0.25)
+    
+    # Penalize numbered instructions or steps with detailed content (the
+    # pattern needs a leading digit and at least 33 characters)
+    if len(text) >= 33 and text[:1].isdigit() and _LONG_NUMBERED_ITEM.match(text):
+        penalties.append(0.4)
+    
+    # Penalize text that starts with action verbs (instructions)
+    first_word = words[0] if words else ""
+    if first_word in _ACTION_VERBS:
+        penalties.append(0.4)
+    
+    return _TextTerms(
+        False,
+        _content_quality_score(text, text_lower, len(words)),
+        _content_pattern_terms(text, text_lower),
+        tuple(penalties)
+    )
+
+def _typography_scores(size_ratios: np.ndarray, is_bold: np.ndarray,
+                       is_italic: np.ndarray, is_underlined: np.ndarray) -> np.ndarray:
+    """Score each block's relative font size and formatting"""
+    # 1. FONT SIZE ANALYSIS (35% weight - reduced to accommodate formatting)
+    # Significantly larger, moderately larger, same size or close (common in recipes)
+    scores = np.select(
+        [size_ratios >= 1.5, size_ratios >= 1.2, size_ratios >= 0.95],
+        [0.35, 0.25, 0.05], default=0.0
+    )
+    
+    # 2. FONT FORMATTING (30% weight - increased for recipe-style docs)
+    formatting = np.zeros(len(size_ratios))
+    # Bold text is often used for headings in recipes
+    formatting += np.where(is_bold, 0.25, 0.0)
+    # Extra boost for bold text at body size (common pattern in recipes)
+    formatting += np.where(is_bold & (size_ratios >= 0.90) & (size_ratios <= 1.10), 0.10, 0.0)
+    # Underlined text often indicates headings in recipe documents
+    formatting += np.where(is_underlined, 0.20, 0.0)
+    # Italic is less common for headings but can indicate special sections
+    formatting += np.where(is_italic, 0.05, 0.0)
+    # Bold + underlined is strong heading indicator
+    formatting += np.where(is_bold & is_underlined, 0.10, 0.0)
+    
+    scores += np.minimum(formatting, 0.30)  # Cap formatting score
+    return scores
+
+
 class EnhancedFontStrategy(BaseStrategy):
     """Enhanced universal font-based heading detection"""
     
     def __init__(self):
         self.confidence = 0.95
         
-        # Universal noise patterns to filter out (not domain-specific)
-        self.noise_patterns = [
-            # UI elements and artifacts
-            r'^[©®™]\s*\w*$',                    # Copyright symbols
-            r'^\s*[x×]\s*$',                     # Close buttons
-            r'^[<>]\s*\w*$',                     # Navigation elements
-            r'^\s*\d{1,2}\s*$',                  # Standalone numbers
-            r'^[^\w\s]*$',                       # Only punctuation/symbols
-            r'^\s*[A-Z]{1,2}\d+\s*$',           # Element IDs like "A2", "H1"
-            
-            # OCR artifacts and errors  
-            r'^[A-Z]{1,2}\s+[A-Z]{1,2}[^a-z]*$', # "A B", "O01", etc.
-            r'.*[,]{2,}.*',                      # Multiple commas (OCR error)
-            r'.*[.]{3,}.*',                      # Multiple dots (OCR error)
-            r'^[^\w\s]*[A-Z]{1,3}[^\w\s]*$',    # Single letters with symbols
-            r'^.{1,3}$',                         # Very short fragments (1-3 chars)
-            r'^[A-Z]\s[a-z]\s*$',                # "A Export a POF" -> "A Export"
-            
-            # Common OCR mistakes
-            r'.*\bPOF\b.*',                      # "POF" instead of "PDF"
-            r'.*\bOﬃce\b.*',                    # "Oﬃce" instead of "Office"
-            r'^[A-Z]{1,2}[^a-zA-Z\s]+.*',       # Single letter followed by symbols
-            r'^CG\s+\w+.*',                     # "CG Connected" OCR errors
-            r'^[A-Z]{2}\s+[A-Z].*',             # "CG Connected", "AB Something" patterns
-            
-            # Navigation and UI text
-            r'^(Help|Cancel|Close|OK|Next|Back|Continue|Submit)$',
-            r'^(All\s+tools?|Tools?|Menu|Settings?).*',
-            r'^(Export|Import|Create|Delete|Edit)\s+[a-z].*',  # Menu items
-            r'^(Share|Send|Upload|Download)\s*$',
-            r'^(Home|Search|Profile|Account)\s*$',
-            
-            # Common UI fragments and button text
-            r'.*\s[+=×÷]\s.*',                   # Math operators in UI
-            r'^(Good\s+morning|Hello|Welcome).*', # Greeting text
-            r'^\([^)]*\)\s*$',                   # Text in parentheses only
-            r'^[\d\s\-\|]+$',                    # Only numbers, spaces, dashes, pipes
-            r'^[A-Z]{1,2}\s+[A-Z]{1,2}\s*$',    # "A B", "H1 H2" patterns
-            
-            # Generic noise patterns
-            r'^(Note:?|Note|Tip:?|Warning:?).*',  # Enhanced note indicators (any text after)
-            r'^notes?(\s+\w+)*$',                # "Note", "Notes", "Note something"
-            r'^(Step\s+\d+:?)$',                # Step indicators without content
-            r'^(Figure\s+\d+|Table\s+\d+).*',   # Figure/table references
-        ]
-        
-        # Patterns for quality headings (universal)
-        self.quality_heading_patterns = [
-            # Clear section headers
-            r'^[A-Z][a-z]+(\s+[A-Z][a-z]*)*\s*$',           # Title Case
-            r'^[A-Z][A-Z\s]+[A-Z]$',                        # ALL CAPS HEADINGS
-            r'^\d+\.?\s+[A-Z][a-z].*$',                     # Numbered sections
-            r'^[A-Z][a-z]+.*:$',                            # Headers ending with colon
-            r'^(Chapter|Section|Part|Unit)\s+\d+.*$',       # Structural headings
-            r'^(Overview|Introduction|Conclusion|Summary)$', # Standard section names
-            
-            # Universal document patterns for different content types
-            r'^[A-Z][a-z]+(\s+[A-Z][a-z]+)*$',             # Title Case: "Project Management", "Data Analysis" 
-            r'^[A-Z][a-z]+(\s+[a-z]+)*(\s+[A-Z][a-z]+)*$', # Mixed case: "Sales and Marketing"
-            r'^[A-Z][a-z]+\s+(with|and|in|on|for)\s+[A-Z][a-z]+.*$', # "Analysis with Python"
-            r'^(Chapter|Section|Part|Introduction|Overview|Summary|Conclusion|Method|Process|Results).*$', # Common section headers
-            r'^(Step|Phase|Stage)\s*\d*\s*:.*$',           # Sequential information
-            r'^[A-Z][a-z]+(\s+[A-Z][a-z]+)*\s*$',         # Clean multi-word titles
-        ]
-        
-        # Content words that suggest this is body text, not a heading
-        self.body_text_indicators = [
-            'the', 'and', 'or', 'but', 'with', 'from', 'into', 'onto', 'until',
-            'when', 'where', 'while', 'during', 'before', 'after', 'through',
-            'is', 'are', 'was', 'were', 'will', 'would', 'could', 'should',
-            'this', 'that', 'these', 'those', 'you', 'your', 'they', 'their'
-        ]
+        # Memoize heading cleanup by text: the same headings recur across
+        # pages and documents ("Overview", "Ingredients:")
+        self._extract_clean_heading = lru_cache(maxsize=2048)(self._extract_clean_heading)
     
     def detect(self, blocks: List[Dict], profile: Dict) -> List[Dict]:
         """Enhanced heading detection using font analysis and content quality filtering"""
         try:
             predictions = []
             
+            # Read every block field the analysis needs once, into parallel lists
+            columns = self._build_block_columns(blocks)
+            
             # Step 1: Analyze document typography patterns
-            typography_analysis = self._analyze_document_typography(blocks)
+            typography_analysis = self._analyze_document_typography(columns)
             
             # Step 2: Identify font hierarchy and size clusters
             font_hierarchy = self._build_font_hierarchy(blocks, typography_analysis)
             
             # Step 3: Analyze spatial relationships between blocks
-            spatial_analysis = self._analyze_spatial_relationships(blocks)
+            spatial_analysis = self._analyze_spatial_relationships(columns)
+            
+            # Size and formatting terms of every block's score in one pass
+            typography_scores = self._score_typography(typography_analysis, columns)
+            score_bounds = self._score_upper_bounds(typography_scores, spatial_analysis, columns)
+            typography_scores = typography_scores.tolist()
             
             # Step 4: Score each block for heading likelihood
-            for i, block in enumerate(blocks):
-                text = block.get('text', '').strip()
-                if not text or len(text) < 2:
-                    continue
+            for i, may_split in self._candidate_blocks(columns, score_bounds):
+                block = blocks[i]
+                text = columns['text'][i]
                 
                 # Check if this block contains multiple content items (trailing titles)
-                multi_content_headings = self._extract_multiple_content_items(block, text, i)
+                multi_content_headings = (
+                    self._extract_multiple_content_items(block, text, i) if may_split else []
+                )
                 
                 if multi_content_headings:
                     # Add all extracted content headings from this block
@@ -143,15 +609,14 @@ class EnhancedFontStrategy(BaseStrategy):
                         )
                         content_heading['level'] = level
                         predictions.append(content_heading)
-                else:
+                elif score_bounds[i] > _SCORE_THRESHOLD:
                     # Process as single content block (existing logic)
                     # Calculate comprehensive heading score
                     score = self._calculate_enhanced_heading_score(
-                        block, text, typography_analysis, font_hierarchy, 
-                        spatial_analysis, i, blocks
+                        text, typography_scores[i], spatial_analysis, i, columns
                     )
                     
-                    if score > 0.3:  # Threshold suitable for various document types
+                    if score > _SCORE_THRESHOLD:  # Threshold suitable for various document types
                         level = self._determine_hierarchical_level(
                             block, font_hierarchy, score
                         )
@@ -176,24 +641,37 @@ class EnhancedFontStrategy(BaseStrategy):
             predictions = self._post_process_predictions(predictions, blocks)
             
             logger.info(f"Enhanced font strategy found {len(predictions)} headings")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Text score cache: {_text_terms.cache_info()}")
             return predictions
             
         except Exception as e:
             logger.error(f"Error in enhanced font strategy: {e}")
             return []
     
-    def _analyze_document_typography(self, blocks: List[Dict]) -> Dict:
+    def _build_block_columns(self, blocks: List[Dict]) -> Dict[str, List]:
+        """Gather per-block fields into parallel lists indexed by block position"""
+        return {
+            'text': [block.get('text', '').strip() for block in blocks],
+            'font_size': [block.get('font_size', 12) for block in blocks],
+            'font': [block.get('font', 'default') for block in blocks],
+            'is_bold': [block.get('is_bold', False) for block in blocks],
+            'is_italic': [block.get('is_italic', False) for block in blocks],
+            'is_underlined': [block.get('is_underlined', False) for block in blocks],
+            'y': [block.get('y', 0) for block in blocks],
+            'height': [block.get('height', 0) for block in blocks]
+        }
+    
+    def _analyze_document_typography(self, columns: Dict[str, List]) -> Dict:
         """Analyze typography patterns across the entire document"""
+        block_count = len(columns['text'])
         
         # Check if blocks is empty
-        if not blocks:
+        if not block_count:
             logger.warning("Enhanced font strategy received empty blocks list")
             return {
                 'body_size': 12,
-                'size_stats': {
-                    'mean': 12, 'median': 12, 'std': 0, 'min': 12, 'max': 12,
-                    'unique_sizes': [12]
-                },
+                'size_stats': {'unique_sizes': [12]},
                 'primary_font': 'default',
                 'font_distribution': {'default': 0},
                 'bold_ratio': 0,
@@ -201,73 +679,53 @@ class EnhancedFontStrategy(BaseStrategy):
                 'underlined_ratio': 0
             }
         
-        font_sizes = []
-        font_names = defaultdict(int)
-        bold_blocks = 0
-        italic_blocks = 0
-        underlined_blocks = 0
-        
-        for block in blocks:
-            # Collect font sizes - be more defensive about missing/zero sizes
-            size = block.get('font_size')
-            if size is None or size <= 0:
-                size = 12  # Use default for missing/invalid sizes
-            font_sizes.append(size)
-            
-            # Count font families
-            font_name = block.get('font', 'default')
-            font_names[font_name] += 1
-            
-            # Count formatting
-            if block.get('is_bold', False):
-                bold_blocks += 1
-            if block.get('is_italic', False):
-                italic_blocks += 1
-            if block.get('is_underlined', False):
-                underlined_blocks += 1
+        # Collect font sizes - be more defensive about missing/zero sizes
+        # (use default for missing/invalid sizes; None converts to NaN)
+        font_sizes = np.array(columns['font_size'], dtype=np.float64)
+        font_sizes[~(font_sizes > 0)] = 12
+        
+        # Count font families
+        font_names = Counter(columns['font'])
+        
+        # Count formatting
+        bold_blocks = sum(map(bool, columns['is_bold']))
+        italic_blocks = sum(map(bool, columns['is_italic']))
+        underlined_blocks = sum(map(bool, columns['is_underlined']))
         
         # Handle case when no font sizes are found
-        if not font_sizes:
+        if not font_sizes.size:
             logger.warning("No font sizes found in document, using defaults")
             return {
                 'body_size': 12,
-                'size_stats': {
-                    'mean': 12, 'median': 12, 'std': 0, 'min': 12, 'max': 12,
-                    'unique_sizes': [12]
-                },
+                'size_stats': {'unique_sizes': [12]},
                 'primary_font': 'default',
-                'font_distribution': {'default': len(blocks)},
-                'bold_ratio': bold_blocks / len(blocks) if blocks else 0,
-                'italic_ratio': italic_blocks / len(blocks) if blocks else 0,
-                'underlined_ratio': underlined_blocks / len(blocks) if blocks else 0
+                'font_distribution': {'default': block_count},
+                'bold_ratio': bold_blocks / block_count,
+                'italic_ratio': italic_blocks / block_count,
+                'underlined_ratio': underlined_blocks / block_count
             }
         
-        # Calculate size statistics
-        size_array = np.array(font_sizes)
-        size_stats = {
-            'mean': np.mean(size_array),
-            'median': np.median(size_array),
-            'std': np.std(size_array),
-            'min': np.min(size_array),
-            'max': np.max(size_array),
-            'unique_sizes': sorted(list(set(font_sizes)), reverse=True)
-        }
+        # Count sizes in one pass for both the unique sizes and the body size
+        # (the font hierarchy reads only the unique sizes)
+        unique_sizes, first_seen, size_counts = np.unique(
+            font_sizes, return_index=True, return_counts=True)
+        size_stats = {'unique_sizes': unique_sizes[::-1].tolist()}
         
-        # Determine body text size (most common size)
-        size_counter = Counter(font_sizes)
-        body_size = size_counter.most_common(1)[0][0]
+        # Determine body text size (most common size, first seen on ties)
+        most_common = size_counts == size_counts.max()
+        body_size = unique_sizes[most_common][first_seen[most_common].argmin()].item()
         
         # Determine primary font
-        primary_font = max(font_names.items(), key=lambda x: x[1])[0] if font_names else 'default'
+        primary_font = font_names.most_common(1)[0][0] if font_names else 'default'
         
         return {
             'body_size': body_size,
             'size_stats': size_stats,
             'primary_font': primary_font,
             'font_distribution': dict(font_names),
-            'bold_ratio': bold_blocks / len(blocks) if blocks else 0,
-            'italic_ratio': italic_blocks / len(blocks) if blocks else 0,
-            'underlined_ratio': underlined_blocks / len(blocks) if blocks else 0
+            'bold_ratio': bold_blocks / block_count,
+            'italic_ratio': italic_blocks / block_count,
+            'underlined_ratio': underlined_blocks / block_count
         }
     
     def _build_font_hierarchy(self, blocks: List[Dict], typography: Dict) -> Dict:
@@ -279,20 +737,27 @@ class EnhancedFontStrategy(BaseStrategy):
         if not unique_sizes:
             unique_sizes = [body_size]
         
-        # Create size-based hierarchy
+        # Create size-based hierarchy keyed by quantized size, so sizes that
+        # differ only by float noise from the PDF share one level
+        # (unique_sizes is largest first, so each level is decided by the
+        # largest size sharing the key)
         hierarchy = {}
-        for i, size in enumerate(unique_sizes):
+        largest_sizes = {}
+        for size in unique_sizes:
+            largest_sizes.setdefault(_size_key(size), size)
+        
+        for i, (key, size) in enumerate(largest_sizes.items()):
             if size > body_size * 1.5:  # Significantly larger than body
                 if i == 0:
-                    hierarchy[size] = 'H1'  # Largest
+                    hierarchy[key] = 'H1'  # Largest
                 elif i == 1:
-                    hierarchy[size] = 'H2'  # Second largest
+                    hierarchy[key] = 'H2'  # Second largest
                 else:
-                    hierarchy[size] = 'H3'  # Other large sizes
+                    hierarchy[key] = 'H3'  # Other large sizes
             elif size > body_size * 1.2:  # Moderately larger
-                hierarchy[size] = 'H3'
+                hierarchy[key] = 'H3'
             elif size >= body_size * 0.95:  # Same or slightly different (common in recipes)
-                hierarchy[size] = 'H4'  # Potential subheading if bold/underlined
+                hierarchy[key] = 'H4'  # Potential subheading if bold/underlined
         
         return {
             'size_levels': hierarchy,
@@ -300,247 +765,110 @@ class EnhancedFontStrategy(BaseStrategy):
             'heading_threshold': body_size * 0.95  # Lower threshold for recipe-style documents
         }
     
-    def _analyze_spatial_relationships(self, blocks: List[Dict]) -> Dict:
+    def _analyze_spatial_relationships(self, columns: Dict[str, List]) -> Dict:
         """Analyze spatial relationships between blocks"""
-        relationships = {}
-        
-        for i, block in enumerate(blocks):
-            current_y = block.get('y', 0)
-            
-            # Find blocks before and after
-            prev_block = blocks[i-1] if i > 0 else None
-            next_block = blocks[i+1] if i < len(blocks) - 1 else None
-            
-            # Calculate spacing
-            spacing_before = 0
-            spacing_after = 0
-            
-            if prev_block:
-                prev_y = prev_block.get('y', 0) + prev_block.get('height', 0)
-                spacing_before = max(0, current_y - prev_y)
-            
-            if next_block:
-                current_bottom = current_y + block.get('height', 0)
-                next_y = next_block.get('y', 0)
-                spacing_after = max(0, next_y - current_bottom)
-            
-            relationships[i] = {
-                'spacing_before': spacing_before,
-                'spacing_after': spacing_after,
-                'has_space_before': spacing_before > 5,  # More than 5 units
-                'has_space_after': spacing_after > 3,   # More than 3 units
-                'isolated': spacing_before > 10 and spacing_after > 10
-            }
-        
-        return relationships
+        # Gap between each block's bottom and the next block's top
+        tops = np.array(columns['y'], dtype=np.float64)
+        bottoms = tops + np.array(columns['height'], dtype=np.float64)
+        gaps = np.maximum(0, tops[1:] - bottoms[:-1])
+        
+        spacing_before = np.zeros(len(tops))
+        spacing_before[1:] = gaps
+        spacing_after = np.zeros(len(tops))
+        spacing_after[:-1] = gaps
+        
+        # Per-block lists indexed by block position; plain lists keep
+        # per-block lookups in the scoring loop cheap
+        return {
+            'spacing_before': spacing_before.tolist(),
+            'spacing_after': spacing_after.tolist(),
+            'has_space_before': (spacing_before > 5).tolist(),  # More than 5 units
+            'has_space_after': (spacing_after > 3).tolist(),    # More than 3 units
+            'isolated': ((spacing_before > 10) & (spacing_after > 10)).tolist()
+        }
     
-    def _calculate_enhanced_heading_score(self, block: Dict, text: str, 
-                                         typography: Dict, font_hierarchy: Dict,
-                                         spatial: Dict, block_index: int, 
-                                         all_blocks: List[Dict]) -> float:
-        """Calculate comprehensive heading score using multiple factors"""
-        score = 0.0
-        
-        # 1. FONT SIZE ANALYSIS (35% weight - reduced to accommodate formatting)
-        font_size = block.get('font_size', 12)
+    def _candidate_blocks(self, columns: Dict[str, List],
+                          score_bounds: List[float]) -> List[Tuple[int, bool]]:
+        """Blocks that could yield a heading, and whether each may split into several"""
+        # A block needs sentence punctuation to split into several headings,
+        # and a score bound above the threshold to be a heading on its own
+        candidates = []
+        for i, (text, bound) in enumerate(zip(columns['text'], score_bounds)):
+            if len(text) < 2:
+                continue
+            may_split = _SPLIT_PUNCTUATION.search(text) is not None
+            if may_split or bound > _SCORE_THRESHOLD:
+                candidates.append((i, may_split))
+        return candidates
+    
+    def _score_typography(self, typography: Dict, columns: Dict[str, List]) -> np.ndarray:
+        """Score every block's font size and formatting relative to the body text"""
+        block_count = len(columns['text'])
+        font_sizes = np.array(columns['font_size'], dtype=np.float64)
         body_size = typography['body_size']
-        size_ratio = font_size / body_size if body_size > 0 else 1.0
+        size_ratios = font_sizes / body_size if body_size > 0 else np.ones(block_count)
         
-        if size_ratio >= 1.5:
-            score += 0.35  # Significantly larger
-        elif size_ratio >= 1.2:
-            score += 0.25  # Moderately larger
-        elif size_ratio >= 0.95:  # Same size or close (common in recipes)
-            score += 0.05  # Small boost for same-size text (depends on other factors)
-        
-        # 2. FONT FORMATTING (30% weight - increased for recipe-style docs)
-        formatting_score = 0.0
-        
-        # Bold text is often used for headings in recipes
-        if block.get('is_bold', False):
-            formatting_score += 0.25
-            
-            # Extra boost for bold text at body size (common pattern in recipes)
-            if 0.90 <= size_ratio <= 1.10:
-                formatting_score += 0.10
+        is_bold = np.fromiter(map(bool, columns['is_bold']), dtype=bool, count=block_count)
+        is_italic = np.fromiter(map(bool, columns['is_italic']), dtype=bool, count=block_count)
+        is_underlined = np.fromiter(map(bool, columns['is_underlined']), dtype=bool, count=block_count)
         
-        # Underlined text often indicates headings in recipe documents
-        if block.get('is_underlined', False):
-            formatting_score += 0.20
-        
-        # Italic is less common for headings but can indicate special sections
-        if block.get('is_italic', False):
-            formatting_score += 0.05
+        return _typography_scores(size_ratios, is_bold, is_italic, is_underlined)
+    
+    def _score_upper_bounds(self, typography_scores: np.ndarray, spatial: Dict,
+                            columns: Dict[str, List]) -> List[float]:
+        """Bound each block's heading score from its formatting, spacing and length"""
+        # Mirrors _calculate_enhanced_heading_score up to the length penalty, in
+        # the same order, with the content terms at their maximum. Float
+        # arithmetic is monotonic and the later penalties only subtract, so
+        # no block scores above its bound.
+        bounds = typography_scores + 0.20  # Content quality at its maximum
+        bounds += 0.10  # Content patterns at their maximum
+        bounds += np.where(spatial['has_space_before'], 0.03, 0.0)
+        bounds += np.where(spatial['has_space_after'], 0.02, 0.0)
+        bounds += np.where(spatial['isolated'], 0.01, 0.0)
+        bounds -= np.array([_length_penalty(text) for text in columns['text']])
+        return bounds.tolist()
+    
+    def _calculate_enhanced_heading_score(self, text: str, typography_score: float,
+                                         spatial: Dict, block_index: int,
+                                         columns: Dict[str, List]) -> float:
+        """Calculate comprehensive heading score using multiple factors"""
+        # Text-only parts of the score, computed once per distinct text
+        text_terms = _text_terms(text)
+        if text_terms.is_noise:
+            return 0.0
         
-        # Combination bonuses
-        if block.get('is_bold', False) and block.get('is_underlined', False):
-            formatting_score += 0.10  # Bold + underlined is strong heading indicator
-            
-        score += min(formatting_score, 0.30)  # Cap formatting score
+        # 1-2. FONT SIZE AND FORMATTING (see _typography_scores)
+        score = typography_score
         
         # 3. CONTENT QUALITY ANALYSIS (20% weight)
-        content_score = self._analyze_content_quality(text)
+        content_score = text_terms.content_quality
         score += content_score * 0.20
         
         # 4. CONTENT-SPECIFIC PATTERN ANALYSIS (10% weight)
-        content_score = self._analyze_content_patterns(text, block, all_blocks, block_index)
+        content_score = self._analyze_content_patterns(text_terms.content_patterns, columns, block_index)
         score += content_score * 0.10
         
         # 5. SPATIAL RELATIONSHIPS (5% weight - reduced)
-        if block_index in spatial:
-            spatial_info = spatial[block_index]
-            if spatial_info['has_space_before']:
-                score += 0.03
-            if spatial_info['has_space_after']:
-                score += 0.02
-            if spatial_info['isolated']:
-                score += 0.01
+        if spatial['has_space_before'][block_index]:
+            score += 0.03
+        if spatial['has_space_after'][block_index]:
+            score += 0.02
+        if spatial['isolated'][block_index]:
+            score += 0.01
         
         # Note: Structural patterns analysis removed to focus on universal formatting patterns
         
         # NEGATIVE SCORING - Remove obvious non-headings
-        
-        # Penalize noise patterns heavily
-        for pattern in self.noise_patterns:
-            if re.match(pattern, text, re.IGNORECASE):
-                return 0.0  # Completely eliminate noise
-        
-        # Early filter for common noise patterns that slip through
-        if text.strip().lower() in ['note:', 'note', 'tip:', 'tip', 'warning:', 'warning']:
-            return 0.0
-        
-        # Early filter for OCR errors
-        if any(error in text.lower() for error in ['pof', 'cg connected', 'all tools x']):
-            return 0.0
-        
-        # Penalize very long text (likely paragraphs or instructions)
-        # BUT: Be lenient with recipe ingredient lists which naturally combine heading + content
-        is_recipe_heading = ('ingredients:' in text.lower() or 
-                           text.lower().endswith('ingredients') or
-                           any(word in text.lower() for word in ['recipe', 'preparation', 'cooking']))
-        
-        if is_recipe_heading:  # If this looks like a recipe heading, be lenient on length
-            if len(text) > 400:  # Only penalize extremely long text
-                score -= 0.2
-        else:
-            # Apply normal length penalties for non-recipe text
-            if len(text) > 200:
-                score -= 0.5
-            elif len(text) > 100:
-                score -= 0.3
-            elif len(text) > 80:
-                score -= 0.1
-        
-        # Penalize text with too many body text indicators
-        words = text.lower().split()
-        if len(words) > 0:
-            body_word_count = sum(1 for word in words if word in self.body_text_indicators)
-            if body_word_count / len(words) > 0.3:
-                score -= 0.3
-        
-        # Penalize sentences (end with punctuation, likely content)
-        if re.match(r'.*[.!?]\s*$', text) and len(words) > 5:
-            score -= 0.25
-        
-        # Penalize numbered instructions or steps with detailed content
-        if re.match(r'^\d+\.\s+.{30,}', text):  # Long numbered instructions
-            score -= 0.4
-        
-        # Penalize text that starts with action verbs (instructions)
-        action_verbs = ['select', 'click', 'choose', 'type', 'enter', 'press', 'drag', 'drop']
-        first_word = words[0] if words else ""
-        if first_word.lower() in action_verbs:
-            score -= 0.4
+        for penalty in text_terms.penalties:
+            score -= penalty
         
         return max(0.0, min(1.0, score))  # Clamp to [0, 1]
     
     def _analyze_content_quality(self, text: str) -> float:
         """Analyze if text looks like a quality heading vs noise/body text"""
-        score = 0.0
-        
-        # Early rejection for obvious noise
-        if len(text.strip()) < 2:
-            return 0.0
-            
-        # Check for quality heading patterns
-        for pattern in self.quality_heading_patterns:
-            if re.match(pattern, text):
-                score += 0.8
-                break
-        
-        # Length analysis - more lenient for recipe names
-        word_count = len(text.split())
-        if 1 <= word_count <= 8:
-            score += 0.6  # Good heading length
-        elif 9 <= word_count <= 15:
-            score += 0.3  # Acceptable heading length
-        elif word_count == 0:
-            return 0.0   # No content
-        else:
-            score -= 0.1  # Reduced penalty for longer text (could be recipe names)
-        
-        # Character analysis
-        if text.istitle():  # Title Case
-            score += 0.4
-        elif text.isupper() and word_count <= 6:  # Short ALL CAPS
-            score += 0.3
-        
-        # Boost for clear section indicators  
-        section_indicators = [
-            'overview', 'introduction', 'conclusion', 'summary',
-            'chapter', 'section', 'part', 'step', 'method', 'process'
-        ]
-        if any(indicator in text.lower() for indicator in section_indicators):
-            score += 0.3
-            
-        # RECIPE-SPECIFIC BOOSTS
-        # Recipe names often follow patterns like "Chicken and Rice", "Beef Stir-Fry"
-        recipe_patterns = [
-            r'^[A-Z][a-z]+(\s+(and|with|in|&)\s+[A-Z][a-z]+)+$',  # "Chicken and Rice"
-            r'^[A-Z][a-z]+\s+[A-Z][a-z]+(\s+[A-Z][a-z]+)*$',      # "Chicken Alfredo", "Beef Stir Fry"
-            r'^[A-Z][a-z]+(\s+[a-z]+)*\s+[A-Z][a-z]+$',           # "Sweet and Sour Chicken"
-        ]
-        for pattern in recipe_patterns:
-            if re.match(pattern, text):
-                score += 0.4  # Strong boost for recipe name patterns
-                break
-        
-        # NEGATIVE SCORING for obvious problems
-        
-        # Avoid fragments and errors
-        if any(char in text for char in ['©', '®', '™', '×', '÷']):
-            score -= 0.5
-        
-        # OCR error patterns
-        ocr_error_patterns = [
-            r'\bPOF\b',      # "POF" instead of "PDF"
-            r'\bOﬃce\b',    # "Oﬃce" instead of "Office"
-            r'\b[A-Z]\s[a-z]\b',  # Single letter followed by word
-            r'[A-Z]{3,}[a-z]{1,2}[A-Z]',  # Mixed case errors
-        ]
-        for pattern in ocr_error_patterns:
-            if re.search(pattern, text):
-                score -= 0.4
-                break
-        
-        # Penalize very short text that's not clearly a heading
-        if len(text) <= 3 and not text.isupper():
-            score -= 0.4  # Reduced penalty
-        
-        # Penalize text with numbers that look like UI elements
-        if re.search(r'\d{3,}', text):  # Long numbers (likely IDs)
-            score -= 0.2  # Reduced penalty
-        
-        # Penalize instruction-like text (but be more lenient for recipe names)
-        instruction_starters = ['click', 'select', 'choose', 'type', 'enter', 'press']
-        if any(text.lower().startswith(starter) for starter in instruction_starters):
-            score -= 0.2  # Reduced penalty since recipes might start with cooking verbs
-        
-        # Penalize text that looks like menu items or UI labels
-        if re.match(r'^[A-Z][a-z]*\s+(a|an|the)\s+[A-Z]', text):  # "Export a PDF"
-            score -= 0.2  # Reduced penalty
-        
-        return max(0.0, min(1.0, score))
+        text_lower = text.lower()
+        return _content_quality_score(text, text_lower, len(text_lower.split()))
     
     def _analyze_structural_patterns(self, text: str, index: int, all_blocks: List[Dict]) -> float:
         """Analyze structural patterns that indicate headings"""
@@ -565,121 +893,28 @@ class EnhancedFontStrategy(BaseStrategy):
         
         return score
     
-    def _analyze_content_patterns(self, text: str, block: Dict, all_blocks: List[Dict], index: int) -> float:
+    def _analyze_content_patterns(self, pattern_terms: Tuple[float, Tuple[float, ...]],
+                                  columns: Dict[str, List], index: int) -> float:
         """Analyze patterns specific to any document type (universal approach)"""
-        score = 0.0
-        text_lower = text.lower().strip()
-        
-        # Handle blocks that contain both heading and content (common in many PDF types)
-        # Extract just the heading part (before colon or bullet points)
-        heading_part = text
-        if ':' in text:
-            heading_part = text.split(':')[0].strip()
-        elif '•' in text:
-            heading_part = text.split('•')[0].strip()
-        elif text.count('\n') > 0:
-            # Take first line if multi-line
-            heading_part = text.split('\n')[0].strip()
-        
-        # Use the heading part for analysis
-        heading_lower = heading_part.lower().strip()
-        
-        # 1. COMMON SECTION HEADERS (universal document patterns)
-        section_headers = [
-            'introduction', 'overview', 'summary', 'conclusion', 'results', 'method',
-            'process', 'procedure', 'analysis', 'discussion', 'background', 'objectives',
-            'requirements', 'specifications', 'details', 'information', 'data', 'content'
-        ]
+        score, later_terms = pattern_terms
         
-        for header in section_headers:
-            if header in heading_lower:
-                score += 0.8
-                break
-        
-        # 2. STRUCTURED TITLE PATTERNS (focus on heading part only)
-        heading_word_count = len(heading_part.split())
-        
-        # Short, title-case phrases (1-6 words) are often section names
-        if 1 <= heading_word_count <= 6 and heading_part.istitle():
-            score += 0.6
-            
-        # Titles with common connecting words
-        connecting_words = ['with', 'and', 'in', 'on', 'for', 'of', 'by', 'to']
-        if any(f' {word} ' in heading_lower for word in connecting_words) and heading_word_count <= 8:
-            score += 0.5
-            
-        # 3. DOCUMENT STRUCTURE PATTERNS (universal patterns)
-        structure_patterns = [
-            r'^[A-Z][a-z]+(\s+(and|with|in|of|for)\s+[A-Z][a-z]+)+',  # "Analysis and Results"
-            r'^[A-Z][a-z]+\s+[A-Z][a-z]+(\s+[A-Z][a-z]+)*',          # "Project Management", "Data Analysis"
-            r'^[A-Z][a-z]+(\s+[a-z]+)*\s+[A-Z][a-z]+',               # "Best and Worst Case"
-        ]
-        for pattern in structure_patterns:
-            if re.match(pattern, heading_part):
-                score += 0.6  # Strong boost for structured patterns
-                break
-                
         # 4. FORMATTING CONTEXT ANALYSIS
         # Check if this formatted text is followed by a list or content
-        if index + 1 < len(all_blocks):
-            next_block = all_blocks[index + 1]
-            next_text = next_block.get('text', '').strip()
+        if index + 1 < len(columns['text']):
+            next_text = columns['text'][index + 1]
             
             # If bold/formatted text is followed by a list, it's likely a heading
             if next_text.startswith(('•', '-', '*', '1.', '2.', '3.')):
                 score += 0.4
                 
             # If followed by longer paragraph text, this might be a title
-            if len(next_text) > 50 and not next_block.get('is_bold', False):
+            if len(next_text) > 50 and not columns['is_bold'][index + 1]:
                 score += 0.3
         
-        # 5. SUBSECTION HEADERS
-        # "Details:", "For more information:", etc.
-        if heading_lower.endswith(':') and heading_word_count <= 4:
-            if any(subsection_word in heading_lower for subsection_word in ['detail', 'information', 'note', 'example', 'reference']):
-                score += 0.7
-        
-        # 6. SEQUENTIAL INFORMATION
-        # "Step 1", "Phase 2", "Part A", etc.
-        serving_patterns = [
-            r'(step|phase|part|section|chapter)\s*\d+',
-            r'(stage|level|tier)\s*\d+',
-            r'(appendix|annex)\s*[a-z]',
-            r'\d+\.\d+',  # "2.1", "3.4" etc.
-        ]
-        
-        for pattern in serving_patterns:
-            if re.search(pattern, heading_lower):
-                score += 0.6
-                break
-        
-        # 7. BOOST FOR SECTION NAMES FOLLOWED BY DETAILS
-        if heading_lower.endswith(('details:', 'information:', 'content:', 'overview:')):
-            # Extract the section name part (before "details:")
-            section_name = heading_part.replace(' Details:', '').replace(' Information:', '').replace(' Content:', '').replace(' Overview:', '').strip()
-            section_name_words = len(section_name.split())
-            
-            if 2 <= section_name_words <= 6:  # Good section name length
-                score += 0.8  # Very strong boost for section names with details
-            elif section_name_words > 0:  # Any section name
-                score += 0.6  # Strong boost
-        
-        # 8. AVOID FALSE POSITIVES
-        # Don't boost obvious instruction text 
-        instruction_indicators = [
-            'click', 'select', 'choose', 'enter', 'type', 'press', 'navigate',
-            'open', 'close', 'save', 'delete', 'edit', 'modify'
-        ]
+        # Text-only adjustments, added in their original order
+        for term in later_terms:
+            score += term
         
-        # Only penalize if text starts with action verb and is very long
-        first_word = heading_part.split()[0].lower() if heading_part.split() else ""
-        if first_word in instruction_indicators and len(text) > 100:  # Increased threshold
-            score -= 0.2  # Reduced penalty
-        
-        # Don't boost measurements or data themselves (just their headers)
-        if re.match(r'^\d+\s*(percent|%|mm|cm|kg|lb|inch)', heading_lower):
-            score -= 0.3
-            
         return max(0.0, min(1.0, score))
     
     def _determine_hierarchical_level(self, block: Dict, font_hierarchy: Dict, score: float) -> str:
@@ -688,8 +923,9 @@ class EnhancedFontStrategy(BaseStrategy):
         size_levels = font_hierarchy.get('size_levels', {})
         
         # First try size-based classification
-        if font_size in size_levels:
-            return size_levels[font_size]
+        level = size_levels.get(_size_key(font_size))
+        if level is not None:
+            return level
         
         # Fallback based on score and formatting
         body_size = font_hierarchy.get('body_size', 12)
@@ -786,8 +1022,9 @@ class EnhancedFontStrategy(BaseStrategy):
         size_levels = font_hierarchy.get('size_levels', {})
         
         # First try size-based classification
-        if font_size in size_levels:
-            return size_levels[font_size]
+        level = size_levels.get(_size_key(font_size))
+        if level is not None:
+            return level
         
         # Fallback based on score and formatting
         body_size = font_hierarchy.get('body_size', 12)
@@ -808,68 +1045,58 @@ class EnhancedFontStrategy(BaseStrategy):
             return predictions
         
         # Remove predictions with very low confidence (aligned with main threshold)
-        filtered_predictions = [p for p in predictions if p['confidence'] > 0.3]
+        refined_predictions = sorted(
+            (p for p in predictions if p['confidence'] > 0.3), key=itemgetter('block_id')
+        )
         
         # Ensure hierarchy makes sense (don't jump from H1 to H4)
-        level_order = {'H1': 1, 'H2': 2, 'H3': 3, 'H4': 4}
-        
-        refined_predictions = []
         last_level = 0
-        
-        for prediction in sorted(filtered_predictions, key=lambda x: x['block_id']):
-            current_level = level_order.get(prediction['level'], 4)
+        for prediction in refined_predictions:
+            current_level = _LEVEL_ORDER.get(prediction['level'], 4)
             
             # Don't jump more than one level down
             if last_level > 0 and current_level > last_level + 1:
-                prediction['level'] = f"H{last_level + 1}"
+                current_level = last_level + 1
+                prediction['level'] = f"H{current_level}"
             
-            refined_predictions.append(prediction)
-            last_level = level_order.get(prediction['level'], 4)
+            last_level = current_level
         
         return refined_predictions
     
     def _extract_clean_heading(self, text: str) -> str:
         """Extract clean heading text from any document type, handling multi-content blocks"""
-        import re
-        
         # PATTERN 1: Handle trailing headings at end of text blocks
         # Example: "...in conclusion. Next Topic" or "...see results.  Project Summary"
-        trailing_heading_pattern = r'.*[.!?]\s+([A-Z][^\d\n][^\n.!?]*?)$'
-        
-        match = re.search(trailing_heading_pattern, text, re.UNICODE)
+        match = _TRAILING_HEADING.search(text)
         if match:
             potential_heading = match.group(1).strip()
             # Validate this looks like a heading (not continuation text)
             if (len(potential_heading) < 80 and 
                 potential_heading and 
                 not potential_heading.lower().startswith(('see', 'refer', 'note', 'please', 'for more', 'continue')) and
-                not re.search(r'\b(and|or|with|until|for|minutes?|hours?|step|process)\b', potential_heading.lower())):
+                not _CONTINUATION_WORDS.search(potential_heading.lower())):
                 
                 # Clean up common artifacts and normalize whitespace
-                heading = re.sub(r'\s+', ' ', potential_heading)
-                heading = re.sub(r'[^\w\s\'-éáíóúñç&()\/]$', '', heading).strip()
+                heading = _WHITESPACE_RUN.sub(' ', potential_heading)
+                heading = _TRAILING_ARTIFACT.sub('', heading).strip()
                 return heading
         
         # PATTERN 2: Handle blocks with multiple content items - extract the first heading
         # Pattern: "Content Title  Details:" or "Section Name Content:" (supports Unicode)
-        multi_content_pattern = r'^([^\d\n][^\n]+?)\s+(Details?|Content|Information|Data)\s*:'
-        
-        match = re.search(multi_content_pattern, text, re.UNICODE)
+        match = _MULTI_CONTENT_HEADING.search(text)
         if match:
             heading = match.group(1).strip()
             # Clean up common artifacts and normalize whitespace
-            heading = re.sub(r'\s+', ' ', heading)
-            heading = re.sub(r'[^\w\s\'-éáíóúñç&()\/]$', '', heading).strip()
+            heading = _WHITESPACE_RUN.sub(' ', heading)
+            heading = _TRAILING_ARTIFACT.sub('', heading).strip()
             return heading
         
         # PATTERN 3: Pattern for single content blocks - more flexible (supports Unicode)
-        single_content_pattern = r'^([^\d\n][^\n]+?)\s*(Details?|Information|Content|Summary|Overview|Introduction|Conclusion)\s*:?'
-        
-        match = re.search(single_content_pattern, text, re.UNICODE)
+        match = _SINGLE_CONTENT_HEADING.search(text)
         if match:
             heading = match.group(1).strip()
-            heading = re.sub(r'\s+', ' ', heading)
-            heading = re.sub(r'[^\w\s\'-éáíóúñç&()\/]$', '', heading).strip()
+            heading = _WHITESPACE_RUN.sub(' ', heading)
+            heading = _TRAILING_ARTIFACT.sub('', heading).strip()
             return heading
         
         # PATTERN 4: Handle cases where text starts with heading but no clear pattern
@@ -884,7 +1111,7 @@ class EnhancedFontStrategy(BaseStrategy):
             not first_line.lower().startswith(('see', 'refer', 'note', 'please', 'for more'))):
             
             # Extract just the heading part before any detailed content
-            heading = re.split(r'\s+(?:Details?|Information|Content|Summary)', first_line)[0]
+            heading = _DETAIL_SUFFIX.split(first_line)[0]
             return heading.strip()
         
         # PATTERN 5: Fallback: extract first few words that look like a heading
@@ -910,12 +1137,8 @@ class EnhancedFontStrategy(BaseStrategy):
         
         # Pattern for detecting multiple content items in one block
         # Look for pattern: "...text. Title1 ...more text... Title2 ..."
-        import re
-        
         # Split on sentence endings followed by title-case words
-        content_split_pattern = r'([.!?])\s+([A-Z][A-Za-z\s&\'-]{1,50})(?=\s+[A-Z]|\s*$|[.!?])'
-        
-        matches = list(re.finditer(content_split_pattern, text))
+        matches = list(_CONTENT_SPLIT.finditer(text))
         
         if matches:
             for match in matches:
@@ -925,7 +1148,7 @@ class EnhancedFontStrategy(BaseStrategy):
                 if (len(potential_title) > 2 and 
                     len(potential_title) < 60 and
                     not potential_title.lower().startswith(('see', 'refer', 'note', 'please')) and
-                    not re.search(r'\b(step|process|continue|follow|next)\s+\d', potential_title.lower())):
+                    not _NUMBERED_CONTINUATION.search(potential_title.lower())):
                     
                     headings.append({
                         'block_id': block_index,
@@ -1,4 +1,5 @@
 # src/outline_extraction/strategies/ml_strategy.py
+import re
 import pickle
 import numpy as np
 from typing import List, Dict, Optional
@@ -10,6 +11,12 @@ from config.settings import MODELS_DIR
 
 logger = logging.getLogger(__name__)
 
+# Numbered heading prefix ("2 ", "2. ")
+_NUMBERED = re.compile(r'^\d+\.?\s+')
+# Section number prefix ("2", "2.1", "2.1.3"); its dot count gives the depth
+_SECTION_NUMBER = re.compile(r'^(\d+(?:\.\d+)*)')
+_CHAPTER = re.compile(r'^Chapter\s+\d+', re.IGNORECASE)
+
 class MLStrategy(BaseStrategy):
     """Machine learning based heading detection"""
     
@@ -146,8 +153,7 @@ class MLStrategy(BaseStrategy):
     
     def _is_numbered(self, text: str) -> bool:
         """Check if text starts with numbering"""
-        import re
-        return bool(re.match(r'^\d+\.?\s+', text))
+        return bool(_NUMBERED.match(text))
     
     def _has_keywords(self, text: str, profile: Dict) -> bool:
         """Check if text contains document-specific keywords"""
@@ -174,8 +180,7 @@ class MLStrategy(BaseStrategy):
         font_size = block.get('font_size', 0)
         
         # Check numbering depth
-        import re
-        match = re.match(r'^(\d+(?:\.\d+)*)', text)
+        match = _SECTION_NUMBER.match(text)
         if match:
             number = match.group(1)
             depth = number.count('.') + 1
@@ -219,8 +224,7 @@ class MLStrategy(BaseStrategy):
                 confidence = max(confidence, 0.5)
             
             # Check patterns
-            import re
-            if re.match(r'^\d+\.?\s+', text) or re.match(r'^Chapter\s+\d+', text, re.I):
+            if _NUMBERED.match(text) or _CHAPTER.match(text):
                 is_heading = True
                 confidence = max(confidence, 0.7)
             
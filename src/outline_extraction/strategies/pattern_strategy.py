@@ -6,6 +6,14 @@ from collections import defaultdict
 from .base_strategy import BaseStrategy
 from config.patterns import HEADING_PATTERNS
 
+# Section number prefix ("2", "2.1", "2.1.3"); its dot count gives the depth
+_SECTION_NUMBER = re.compile(r'^(\d+(?:\.\d+)*)')
+
+# Named section prefixes
+_CHAPTER = re.compile(r'^Chapter', re.IGNORECASE)
+_SECTION = re.compile(r'^Section', re.IGNORECASE)
+_PART = re.compile(r'^Part', re.IGNORECASE)
+
 class PatternStrategy(BaseStrategy):
     """Pattern-based heading detection"""
     
@@ -70,7 +78,7 @@ class PatternStrategy(BaseStrategy):
         # Numbered patterns with depth
         if pattern_matches.get('numbered'):
             # Count dots to determine level
-            match = re.match(r'^(\d+(?:\.\d+)*)', text)
+            match = _SECTION_NUMBER.match(text)
             if match:
                 number = match.group(1)
                 dots = number.count('.')
@@ -84,11 +92,11 @@ class PatternStrategy(BaseStrategy):
         
         # Named patterns (Chapter, Section, etc.)
         if pattern_matches.get('named'):
-            if re.match(r'^Chapter', text, re.I):
+            if _CHAPTER.match(text):
                 return 'H1'
-            elif re.match(r'^Section', text, re.I):
+            elif _SECTION.match(text):
                 return 'H2'
-            elif re.match(r'^Part', text, re.I):
+            elif _PART.match(text):
                 return 'H1'
         
         # Academic patterns
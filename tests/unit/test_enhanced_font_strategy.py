@@ -0,0 +1,94 @@
+"""Tests for EnhancedFontStrategy scoring helpers."""
+import random
+import string
+
+import pytest
+
+from src.outline_extraction.strategies import enhanced_font_strategy as efs
+
+# Pieces that reach deep into the noise and quality-heading patterns
+_TOKENS = (
+    'Help', 'Note', 'notes', 'Step 2:', 'Figure 3', 'Chapter 1', 'Overview',
+    'Data Analysis', 'Sales and Marketing', 'Analysis with Python', 'CG Connected',
+    'A B', 'POF', 'All tools', 'Export a', 'Results', '(hi)', '12 - 3 |', '...',
+    ',,', ' + ', ':', 'SUMMARY', 'x', 'Ab', ' ', '\t', '\v', '\x1c', '\x1f', '\n',
+)
+_CHARS = string.printable + '\v\x1c\x1d\x1e\x1f\x00'
+
+def _random_ascii_text(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(1, 5)):
+        if rng.random() < 0.7:
+            parts.append(rng.choice(_TOKENS))
+        else:
+            parts.append(''.join(rng.choice(_CHARS) for _ in range(rng.randint(1, 4))))
+    text = ''.join(parts)
+    if rng.random() < 0.2:
+        text += '\n'
+    return text
+
+@pytest.mark.parametrize('pattern_set, alternation', [
+    (efs._NOISE_SET, efs._NOISE),
+    (efs._QUALITY_HEADING_SET, efs._QUALITY_HEADING),
+], ids=['noise', 'quality_heading'])
+def test_re2_set_agrees_with_re_on_ascii(pattern_set, alternation):
+    if pattern_set is None:
+        pytest.skip('google-re2 is not installed')
+
+    rng = random.Random(0)
+    texts = [_random_ascii_text(rng) for _ in range(20000)]
+    texts += ['Help\n', 'Help\n\n', 'A\vB', 'A\x1cb', 'Overview\n', 'Note\x1c', '\v', '']
+
+    for text in texts:
+        assert efs._matches_any(pattern_set, alternation, text) == \
+            (alternation.match(text) is not None), repr(text)
+
+@pytest.mark.parametrize('pattern', [r'^\S+$', r'^a\Z', r'(a)\1', r'[\b]', r'[]a]', r'[^]a]'])
+def test_re2_syntax_refuses_untranslated_constructs(pattern):
+    with pytest.raises(ValueError):
+        efs._to_re2_syntax(pattern)
+
+_HEADING_WORDS = (
+    'Introduction', 'Overview', 'Data Analysis', 'Chapter 1', 'Step 2:', 'Ingredients:',
+    'Sweet and Sour Chicken', 'Project Summary', 'RESULTS', '1. Scope', 'the', 'and',
+    'with', 'click', 'Select', 'Note', 'Hello world.', 'recipe', 'Details:', '• item',
+    '- item', 'Figure 3', '...', 'é', 'A2',
+)
+
+def _random_document(rng: random.Random):
+    blocks = []
+    y = 0
+    for i in range(rng.randint(1, 40)):
+        text = ' '.join(rng.choice(_HEADING_WORDS) for _ in range(rng.choice((1, 1, 2, 3, 5, 12))))
+        height = rng.choice((10, 12, 14, 20))
+        y += height + rng.choice((0, 2, 10, 25))
+        blocks.append({
+            'text': text + ('.' if rng.random() < 0.2 else ''),
+            'font_size': rng.choice((10, 11, 12, 12, 12, 13.2, 14, 16.5, 18, 24)),
+            'font': rng.choice(('Times', 'Times-Bold', 'Arial')),
+            'is_bold': rng.random() < 0.4,
+            'is_italic': rng.random() < 0.1,
+            'is_underlined': rng.random() < 0.1,
+            'page': 1 + i // 20,
+            'y': y,
+            'height': height,
+        })
+    return blocks
+
+def test_score_upper_bound_covers_every_block_score():
+    strategy = efs.EnhancedFontStrategy()
+    rng = random.Random(0)
+
+    for _ in range(500):
+        columns = strategy._build_block_columns(_random_document(rng))
+        typography = strategy._analyze_document_typography(columns)
+        spatial = strategy._analyze_spatial_relationships(columns)
+        typography_scores = strategy._score_typography(typography, columns)
+        bounds = strategy._score_upper_bounds(typography_scores, spatial, columns)
+
+        for i, text in enumerate(columns['text']):
+            score = strategy._calculate_enhanced_heading_score(
+                text, typography_scores[i], spatial, i, columns
+            )
+            # Scores are clamped at 0, which may exceed a negative bound
+            assert score <= max(bounds[i], 0.0), (text, score, bounds[i])